@@ -1,17 +1,32 @@
 import os
-import json
 import re
 import sys
 
 BASE_DIR = os.path.dirname(__file__)
 sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, ".."))
 
 from patterns import GLOSSARY_REGEX, METRIC_REGEX
+from claim_spans import resolve, derive, split_span
+from corpus_io import corpus_name, list_corpus, read_records, write_records
+from quality_gate import QualityGate, QUARANTINE
 
 INPUT_DIR = os.path.join(BASE_DIR, "input_jsonl")
 OUTPUT_DIR = os.path.join(BASE_DIR, "output_jsonl")
+# "", ".gz", ".zst" or ".zip"; inputs are read in whatever form they are in
+OUTPUT_COMPRESSION = ""
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Checked inline as records are written (see quality_gate.py); failing
+# records go to QUARANTINE_PATH instead of OUTPUT_DIR.
+# Mixed roles are left to atomic extraction, which splits them.
+QUALITY_RULES = {
+    "length": QUARANTINE,
+    "glossary": QUARANTINE,
+    "duplicate": QUARANTINE,
+}
+QUARANTINE_PATH = os.path.join(BASE_DIR, "quarantine.jsonl")
+
 
 
 # -------------------------
@@ -24,19 +39,21 @@ GOVERNANCE_WORDS = [
 ]
 
 SPLIT_CONNECTORS = [
-    r"\band\b",
-    r"\bwhile\b",
-    r"\bas part of\b",
-    r"\bas well as\b"
+    re.compile(r"\band\b", re.I),
+    re.compile(r"\bwhile\b", re.I),
+    re.compile(r"\bas part of\b", re.I),
+    re.compile(r"\bas well as\b", re.I)
 ]
 
 
-def is_glossary_sentence(sentence: str) -> bool:
-    return bool(GLOSSARY_REGEX.search(sentence))
+def is_glossary_sentence(text: str, start=0, end=None) -> bool:
+    end = len(text) if end is None else end
+    return bool(GLOSSARY_REGEX.search(text, start, end))
 
 
-def has_metric(sentence: str) -> bool:
-    return bool(METRIC_REGEX.search(sentence))
+def has_metric(text: str, start=0, end=None) -> bool:
+    end = len(text) if end is None else end
+    return bool(METRIC_REGEX.search(text, start, end))
 
 
 def is_governance(sentence: str) -> bool:
@@ -48,26 +65,26 @@ def is_governance(sentence: str) -> bool:
 # BALANCED SENTENCE SPLIT
 # -------------------------
 
-def balanced_split(sentence: str):
+def balanced_split(text: str, start: int, end: int):
     """
-    Split sentence ONLY if:
+    Split text[start:end] ONLY if:
     - it contains a metric AND
     - contains governance or multiple clauses
+    Returns (start, end) spans into text.
     """
-    if not has_metric(sentence):
-        return [sentence]
+    if not has_metric(text, start, end):
+        return [(start, end)]
 
-    parts = [sentence]
+    parts = [(start, end)]
 
     for connector in SPLIT_CONNECTORS:
         new_parts = []
         for p in parts:
-            split = re.split(connector, p, flags=re.I)
+            split = split_span(text, p[0], p[1], connector)
             if len(split) > 1:
-                for s in split:
-                    s = s.strip()
-                    if len(s) > 25:
-                        new_parts.append(s)
+                for s, e in split:
+                    if e - s > 25:
+                        new_parts.append((s, e))
             else:
                 new_parts.append(p)
         parts = new_parts
@@ -105,39 +122,30 @@ def classify(sentence: str, metric: bool) -> str:
 # -------------------------
 
 def refine_file(path):
-    refined = []
+    """
+    Refined records of one file, yielded as they are produced.
+    """
+    for row in read_records(path):
+        text, start, end = resolve(row)
 
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            row = json.loads(line)
-            sentence = row["sentence"]
+        # 1. Drop glossary junk
+        if is_glossary_sentence(text, start, end):
+            continue
 
-            # 1. Drop glossary junk
-            if is_glossary_sentence(sentence):
+        # 2. Balanced split
+        for s, e in balanced_split(text, start, end):
+            if e - s < 30:
                 continue
 
-            # 2. Balanced split
-            split_sentences = balanced_split(sentence)
-
-            for s in split_sentences:
-                s = re.sub(r"\s+", " ", s).strip()
+            metric = has_metric(text, s, e)
+            category = classify(text[s:e], metric)
 
-                if len(s) < 30:
-                    continue
-
-                metric = has_metric(s)
-                category = classify(s, metric)
-
-                refined.append({
-                    "company": row["company"],
-                    "year": row["year"],
-                    "sentence": s,
-                    "category": category,
-                    "has_metric": metric,
-                    "env_relevant": row["env_relevant"]
-                })
-
-    return refined
+            yield derive(
+                row, text, s, e,
+                category=category,
+                has_metric=metric,
+                env_relevant=row["env_relevant"]
+            )
 
 
 # -------------------------
@@ -145,20 +153,18 @@ def refine_file(path):
 # -------------------------
 
 def run_all():
-    for fname in os.listdir(INPUT_DIR):
-        if not fname.endswith(".jsonl"):
-            continue
-
-        in_path = os.path.join(INPUT_DIR, fname)
-        out_path = os.path.join(OUTPUT_DIR, fname)
+    with QualityGate(QUALITY_RULES, QUARANTINE_PATH) as gate:
+        for fname in list_corpus(INPUT_DIR):
+            in_path = os.path.join(INPUT_DIR, fname)
+            out_path = os.path.join(
+                OUTPUT_DIR, corpus_name(fname) + OUTPUT_COMPRESSION
+            )
 
-        refined = refine_file(in_path)
+            n = write_records(out_path, gate.check(refine_file(in_path)))
 
-        with open(out_path, "w", encoding="utf-8") as f:
-            for r in refined:
-                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            print(f"✅ {fname}: {n} balanced-clean sentences")
 
-        print(f"✅ {fname}: {len(refined)} balanced-clean sentences")
+    print(gate.summary())
 
 
 if __name__ == "__main__":
@@ -1,13 +1,31 @@
 import os
-import json
 import re
 
 import sys
 BASE_DIR = os.path.dirname(__file__)
 sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, ".."))
+
+from claim_roles import ROLE_BITS, mask_to_roles, row_role_mask
+from claim_spans import resolve, derive, split_span
+from corpus_io import corpus_name, list_corpus, read_records, write_records
+from quality_gate import QualityGate, QUARANTINE, FLAG
 
 INPUT_DIR = os.path.join(BASE_DIR, "input_jsonl")
 OUTPUT_DIR = os.path.join(BASE_DIR, "output_atomic_jsonl")
+# "", ".gz", ".zst" or ".zip"; inputs are read in whatever form they are in
+OUTPUT_COMPRESSION = ""
+
+# Checked inline as records are written (see quality_gate.py); failing
+# records go to QUARANTINE_PATH instead of OUTPUT_DIR. Mixed-role
+# clauses are only counted.
+QUALITY_RULES = {
+    "length": QUARANTINE,
+    "glossary": QUARANTINE,
+    "duplicate": QUARANTINE,
+    "mixed_role": FLAG,
+}
+QUARANTINE_PATH = os.path.join(BASE_DIR, "quarantine.jsonl")
 
 # =========================
 # ROLE DEFINITIONS (GLOBAL)
@@ -36,44 +54,35 @@ ROLE_PATTERNS = {
     ),
 }
 
-# =========================
-# SENTENCE NORMALIZATION
-# =========================
-
-def normalize(text):
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+# One bit per role (claim_roles.ROLE_BITS, same role names). A clause
+# matching several roles is stored once with the OR of its bits.
 
 # =========================
 # ATOMIC ROLE EXTRACTION
 # =========================
 
-def explode_sentence(sentence):
+CLAUSE_SPLIT = re.compile(r";|,(?!\d)|\.(?!\d)")
+
+
+def explode_sentence(text, start, end):
     """
-    Split a sentence into role-pure atomic claims.
+    Split text[start:end] into atomic claims.
+    Returns (role_mask, start, end) triples, one per clause.
     """
-    # clauses = re.split(r",|;|\.", sentence)
-    clauses = re.split(r";|,(?!\d)|\.(?!\d)", sentence)
     extracted = []
 
-    for clause in clauses:
-        clause = normalize(clause)
-        if len(clause) < 30:
+    for s, e in split_span(text, start, end, CLAUSE_SPLIT):
+        if e - s < 30:
             continue
 
-        matched_roles = [
-            role for role, pat in ROLE_PATTERNS.items()
-            if pat.search(clause)
-        ]
+        mask = 0
+        for role, pat in ROLE_PATTERNS.items():
+            if pat.search(text, s, e):
+                mask |= ROLE_BITS[role]
 
-        # If clause clearly maps to ONE role → keep it
-        if len(matched_roles) == 1:
-            extracted.append((matched_roles[0], clause))
-
-        # If multiple roles → split by priority
-        elif len(matched_roles) > 1:
-            for role in matched_roles:
-                extracted.append((role, clause))
+        # Keep the clause once, with every role it matched
+        if mask:
+            extracted.append((mask, s, e))
 
     return extracted
 
@@ -83,31 +92,28 @@ def explode_sentence(sentence):
 # =========================
 
 def process_file(path):
-    atomic_rows = []
-
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            row = json.loads(line)
-            sentence = normalize(row["sentence"])
-
-            exploded = explode_sentence(sentence)
+    """
+    Atomic records of one file, yielded as they are produced.
+    """
+    for row in read_records(path):
+        text, start, end = resolve(row)
 
-            # If explosion succeeded → replace original
-            if exploded:
-                for role, text in exploded:
-                    atomic_rows.append({
-                        "company": row["company"],
-                        "year": row["year"],
-                        "sentence": text,
-                        "category": role,
-                        "has_metric": role == "metric",
-                        "env_relevant": True
-                    })
-            else:
-                # Keep sentence only if already atomic
-                atomic_rows.append(row)
+        exploded = explode_sentence(text, start, end)
 
-    return atomic_rows
+        # If explosion succeeded → replace original
+        if exploded:
+            for mask, s, e in exploded:
+                yield derive(
+                    row, text, s, e,
+                    category=mask_to_roles(mask)[0],   # primary role
+                    roles=mask,
+                    has_metric=bool(mask & ROLE_BITS["metric"]),
+                    env_relevant=True
+                )
+        else:
+            # Keep sentence only if already atomic
+            row["roles"] = row_role_mask(row)
+            yield row
 
 
 
@@ -116,20 +122,18 @@ def process_file(path):
 # =========================
 
 def run_all():
-    for fname in os.listdir(INPUT_DIR):
-        if not fname.endswith(".jsonl"):
-            continue
-
-        in_path = os.path.join(INPUT_DIR, fname)
-        out_path = os.path.join(OUTPUT_DIR, fname)
+    with QualityGate(QUALITY_RULES, QUARANTINE_PATH) as gate:
+        for fname in list_corpus(INPUT_DIR):
+            in_path = os.path.join(INPUT_DIR, fname)
+            out_path = os.path.join(
+                OUTPUT_DIR, corpus_name(fname) + OUTPUT_COMPRESSION
+            )
 
-        atomic = process_file(in_path)
+            n = write_records(out_path, gate.check(process_file(in_path)))
 
-        with open(out_path, "w", encoding="utf-8") as f:
-            for r in atomic:
-                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            print(f"🔥 {fname}: {n} atomic claims created")
 
-        print(f"🔥 {fname}: {len(atomic)} atomic claims created")
+    print(gate.summary())
 
 
 if __name__ == "__main__":
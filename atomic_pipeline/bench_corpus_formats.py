@@ -0,0 +1,67 @@
+import os
+import tempfile
+import time
+
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+import pyarrow as pa
+
+from atomic_extractor import row_role_mask
+from claim_spans import materialize
+from corpus_io import (
+    JSONL, CSV, PARQUET, ARROW,
+    list_corpus, read_records, write_records
+)
+
+BASE_DIR = os.path.dirname(__file__)
+INPUT_DIR = os.path.join(BASE_DIR, "output_atomic_jsonl")
+REPEAT = 5
+
+# Combined corpus written once per format, then loaded back:
+#   rows/s  -> read_records, dict per row (what the stages see)
+#   table   -> whole-file load into columns (what the notebooks need)
+
+
+def load_rows():
+    rows = []
+    for fname in list_corpus(INPUT_DIR):
+        for row in read_records(os.path.join(INPUT_DIR, fname)):
+            row = materialize(row)
+            row["source_file"] = fname
+            row["roles"] = row_role_mask(row)
+            rows.append(row)
+    return rows
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def load_table(path, fmt):
+    if fmt == PARQUET:
+        return pq.read_table(path)
+    if fmt == ARROW:
+        with pa.memory_map(path) as source:
+            return ipc.open_file(source).read_all()
+    return list(read_records(path))
+
+
+rows = load_rows()
+print(f"Rows: {len(rows)}")
+print(f"{'format':<10}{'bytes':>12}{'rows/s':>14}{'table ms':>12}")
+
+with tempfile.TemporaryDirectory() as tmp:
+    for fmt in (JSONL, CSV, PARQUET, ARROW):
+        path = os.path.join(tmp, "combined" + fmt)
+        write_records(path, rows)
+
+        size = os.path.getsize(path)
+        t_rows = best_of(lambda: sum(1 for _ in read_records(path)))
+        t_table = best_of(lambda: load_table(path, fmt))
+
+        print(f"{fmt:<10}{size:>12}{len(rows) / t_rows:>14.0f}{t_table * 1000:>12.2f}")
@@ -1,43 +1,41 @@
 import os
-import json
-import csv
+
+from atomic_extractor import row_role_mask
+from claim_spans import materialize
+from corpus_io import list_corpus, read_records, write_records
+
 BASE_DIR = os.path.dirname(__file__)
-INPUT_DIR = os.path.join(BASE_DIR, "input_jsonl")
+INPUT_DIR = os.path.join(BASE_DIR, "output_atomic_jsonl")
+# .csv for the notebooks; .parquet / .arrow for the columnar corpus
 OUTPUT_FILE = os.path.join(BASE_DIR, "..", "combined_esg_final.csv")
 
+# Fixed schema: rows are streamed straight to the output file
+FIELDS = [
+    "category", "company", "doc_id", "env_relevant", "has_metric",
+    "page", "roles", "sentence", "source_file", "year"
+]
 
-rows = []
-all_fields = set()
 
 # -------------------------
-# READ ALL JSONL FILES
+# STREAM ALL CORPUS FILES
 # -------------------------
 
-for fname in os.listdir(INPUT_DIR):
-    if not fname.endswith(".jsonl"):
-        continue
+def iter_rows():
+    for fname in list_corpus(INPUT_DIR):
+        path = os.path.join(INPUT_DIR, fname)
 
-    path = os.path.join(INPUT_DIR, fname)
-
-    with open(path, encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            row = json.loads(line)
+        for row in read_records(path):
+            row = materialize(row)
             row["source_file"] = fname  # track origin
-            rows.append(row)
-            all_fields.update(row.keys())
+            row["roles"] = row_role_mask(row)
+            yield row
 
-print(f"📦 Total rows collected: {len(rows)}")
 
 # -------------------------
-# WRITE COMBINED CSV
+# WRITE COMBINED FILE
 # -------------------------
 
-fieldnames = sorted(all_fields)
-
-with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
-    writer = csv.DictWriter(f, fieldnames=fieldnames)
-    writer.writeheader()
-    for r in rows:
-        writer.writerow(r)
+total = write_records(OUTPUT_FILE, iter_rows(), fields=FIELDS)
 
-print(f"✅ Combined CSV written to: {OUTPUT_FILE}")
+print(f"📦 Total rows collected: {total}")
+print(f"✅ Combined file written to: {OUTPUT_FILE}")
@@ -1,30 +1,32 @@
-import json
 import os
-from statistics import mean
+import sys
+
 BASE_DIR = os.path.dirname(__file__)
-DIR = os.path.join(BASE_DIR, "output_atomic_jsonl")
+sys.path.append(os.path.join(BASE_DIR, ".."))
 
+from corpus_io import list_corpus, read_records
+from quality_gate import QualityGate, FLAG
+
+DIR = os.path.join(BASE_DIR, "output_atomic_jsonl")
 
-lengths = []
-mixed_role_violations = 0
-total = 0
+# atomic_extractor.py runs these rules inline while writing; this script
+# re-checks outputs that are already on disk, flagging only.
+RULES = {
+    "length": FLAG,
+    "glossary": FLAG,
+    "duplicate": FLAG,
+    "mixed_role": FLAG,
+}
 
-for fname in os.listdir(DIR):
-    if not fname.endswith(".jsonl"):
-        continue
 
-    with open(os.path.join(DIR, fname), encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            row = json.loads(line)
-            total += 1
-            lengths.append(len(row["sentence"]))
+gate = QualityGate(RULES)
 
-            # Rule: metric sentences must NOT mention governance
-            if row["category"] == "metric":
-                if any(w in row["sentence"].lower()
-                       for w in ["board", "committee", "oversight", "governance"]):
-                    mixed_role_violations += 1
+for fname in list_corpus(DIR):
+    for row in read_records(os.path.join(DIR, fname)):
+        gate.evaluate(row)
 
-print("Total sentences:", total)
-print("Average sentence length:", int(mean(lengths)))
-print("Mixed-role violations:", mixed_role_violations)
+print("Total sentences:", gate.total)
+print("Average sentence length:", int(gate.lengths.mean))
+print("Multi-role clauses:", gate.multi_role)
+print("Mixed-role violations:", gate.violations["mixed_role"])
+print(gate.summary())
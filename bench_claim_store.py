@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+import claim_store
+from claim_spans import materialize
+from corpus_io import list_corpus, read_records
+
+N_CLAIMS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+COMPANIES = 200
+YEARS = range(2015, 2025)
+CATEGORIES = ["metric", "vision", "action", "governance", "marketing", "other"]
+REPEAT = 5
+
+# Claim Search queries (claim_store.search, as the app's search tab
+# runs them) on a store of N_CLAIMS synthetic claims; best of REPEAT.
+
+# Sentences come from the atomic pipeline output, cycled over synthetic
+# companies and years, so term frequencies are those of real reports.
+SOURCE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "atomic_pipeline", "output_atomic_jsonl"
+)
+
+
+def corpus_sentences():
+    return [
+        materialize(r)["sentence"]
+        for f in list_corpus(SOURCE)
+        for r in read_records(os.path.join(SOURCE, f))
+    ]
+
+
+def claims(rng, sentences):
+    for i in range(N_CLAIMS):
+        p = float(rng.random())
+        yield {
+            "company": f"CO{i % COMPANIES:03d}",
+            "year": YEARS[(i // COMPANIES) % len(YEARS)],
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "sentence": f"{sentences[i % len(sentences)]} ({i})",
+            "probability": p,
+            "high_risk": p >= 0.65,
+        }
+
+
+QUERIES = {
+    "keyword":              dict(keyword="net zero"),
+    "rare keyword":         dict(keyword="biodiversity offsets"),
+    "company":              dict(company="CO042"),
+    "company + year":       dict(company="CO042", year=2020),
+    "keyword + company":    dict(keyword="net zero", company="CO042"),
+    "year + high risk":     dict(year=2020, high_risk_only=True),
+    "keyword + category":   dict(keyword="carbon", category="vision"),
+}
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    conn = claim_store.connect(os.path.join(tmp, "claims.db"))
+
+    t0 = time.perf_counter()
+    claim_store.add_claims(conn, claims(np.random.default_rng(0), corpus_sentences()), source="bench")
+    t_load = time.perf_counter() - t0
+    print(f"{N_CLAIMS} claims loaded in {t_load:.0f} s\n")
+
+    print(f"{'query':<22}{'rows':>6}{'ms':>8}")
+    for name, kwargs in QUERIES.items():
+        best = float("inf")
+        for _ in range(REPEAT):
+            t0 = time.perf_counter()
+            rows = claim_store.search(conn, **kwargs)
+            best = min(best, time.perf_counter() - t0)
+        print(f"{name:<22}{len(rows):>6}{best * 1000:>8.1f}")
@@ -0,0 +1,74 @@
+import os
+import time
+
+from esg_extraction import scan_pdf
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PDF_DIR = os.path.join(BASE_DIR, "dataset", "raw_pdf")
+REPEAT = 3
+
+# pages/s of the ESG-section scan per PDF:
+#   full    -> every page through extract_text (original behaviour)
+#   triage  -> cheap text sample first, extract_text only for candidates
+#   stop    -> triage + stop once the financial statements begin
+# Each PDF gets one untimed warm-up pass per mode (file cache, pdfminer
+# imports), then REPEAT rounds with the mode order rotated every round.
+# missed: pages full keeps and triage does not (triage matches keywords
+# on content-stream characters, not on extract_text output).
+
+MODES = {
+    "full": dict(triage=False),
+    "triage": dict(triage=True),
+    "stop": dict(triage=True, stop_at_financials=True),
+}
+
+
+def timed(pdf_path):
+    results = {m: scan_pdf(pdf_path, **kw) for m, kw in MODES.items()}
+    best = dict.fromkeys(MODES, float("inf"))
+    order = list(MODES)
+
+    for i in range(REPEAT):
+        k = i % len(order)
+        for m in order[k:] + order[:k]:
+            t0 = time.perf_counter()
+            scan_pdf(pdf_path, **MODES[m])
+            best[m] = min(best[m], time.perf_counter() - t0)
+
+    return results, best
+
+
+print(
+    f"{'file':<45}{'pages':>6}{'full p/s':>10}{'triage p/s':>12}{'stop p/s':>10}"
+    f"{'skipped':>9}{'missed':>8}{'stop@':>7}"
+)
+
+totals = {"pages": 0, "full": 0.0, "triage": 0.0, "stop": 0.0}
+
+for fname in sorted(os.listdir(PDF_DIR)):
+    if not fname.lower().endswith(".pdf"):
+        continue
+    path = os.path.join(PDF_DIR, fname)
+
+    results, best = timed(path)
+    (full, full_stats), (fast, fast_stats), (_, stop_stats) = (
+        results[m] for m in MODES
+    )
+    missed = len(set(full) - set(fast))
+
+    n = full_stats["pages"]
+    totals["pages"] += n
+    for m in MODES:
+        totals[m] += best[m]
+
+    print(
+        f"{fname:<45}{n:>6}{n / best['full']:>10.1f}{n / best['triage']:>12.1f}"
+        f"{n / best['stop']:>10.1f}{fast_stats['triaged_out']:>9}{missed:>8}"
+        f"{str(stop_stats['stopped_at'] or '-'):>7}"
+    )
+
+n = totals["pages"]
+print(
+    f"{'TOTAL':<45}{n:>6}{n / totals['full']:>10.1f}"
+    f"{n / totals['triage']:>12.1f}{n / totals['stop']:>10.1f}"
+)
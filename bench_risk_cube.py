@@ -0,0 +1,96 @@
+import os
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import claim_store
+import risk_cube
+
+COMPANIES = 100
+YEARS = range(2019, 2024)
+CLAIMS_PER_REPORT = 1_000
+CATEGORIES = ["metric", "vision", "action", "governance", "marketing", "other"]
+THRESHOLDS = [0.5, 0.65, 0.8]
+REPEAT = 5
+
+# Scoring synthetic reports into a fresh claim store (and the share of
+# that spent refreshing risk cube cells), then reading the trend table
+# (exposure per company and year) at several thresholds:
+#   claims -> GROUP BY over the scored claims
+#   cube   -> risk_cube.exposure over the histograms
+# Both reads must agree (thresholds on the 1/BINS grid).
+
+
+def report(rng, company, year):
+    n = CLAIMS_PER_REPORT
+    prob = rng.random(n).round(3)
+    return pd.DataFrame({
+        "sentence": [f"claim {company} {year} {i}" for i in range(n)],
+        "probability": prob,
+        "high_risk": prob >= 0.65,
+        "category": rng.choice(CATEGORIES, n)
+    })
+
+
+def load(conn):
+    rng = np.random.default_rng(0)
+    t = 0.0
+    for c in range(COMPANIES):
+        for year in YEARS:
+            df = report(rng, c, year)
+            t0 = time.perf_counter()
+            claim_store.add_scored_report(conn, f"CO{c:03d}_{year}_esg", df)
+            t += time.perf_counter() - t0
+    return t
+
+
+def from_claims(conn, threshold):
+    return [
+        (r["company"], r["year"], r["total_claims"], r["high_risk_claims"])
+        for r in conn.execute(
+            "SELECT company, year, COUNT(*) AS total_claims,"
+            " SUM(probability >= ?) AS high_risk_claims FROM claims"
+            " WHERE probability IS NOT NULL GROUP BY company, year"
+            " ORDER BY company, year",
+            (threshold,)
+        )
+    ]
+
+
+def from_cube(conn, threshold):
+    return [
+        (r["company"], r["year"], r["total_claims"], r["high_risk_claims"])
+        for r in risk_cube.exposure(conn, threshold)
+    ]
+
+
+def best(fn, *args):
+    t = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        t = min(t, time.perf_counter() - t0)
+    return result, t
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    cubed = claim_store.connect(os.path.join(tmp, "claims.db"))
+
+    n = COMPANIES * len(YEARS) * CLAIMS_PER_REPORT
+    t_write = load(cubed)
+    # rebuild = one refresh per company-year, as done while scoring
+    _, t_refresh = best(risk_cube.rebuild, cubed)
+    cells = cubed.execute("SELECT COUNT(*) FROM risk_cube").fetchone()[0]
+
+    print(f"{COMPANIES * len(YEARS)} reports, {n} scored claims, {cells} cube rows\n")
+    print(f"scoring writes: {n / t_write:,.0f} claims/s, "
+          f"{t_refresh / t_write:.0%} of it cube refresh\n")
+
+    print(f"{'threshold':>10}{'claims ms':>11}{'cube ms':>9}")
+    for threshold in THRESHOLDS:
+        expected, t_claims = best(from_claims, cubed, threshold)
+        got, t_cube_read = best(from_cube, cubed, threshold)
+        assert got == expected, f"cube disagrees with claims at {threshold}"
+        print(f"{threshold:>10}{t_claims * 1000:>11.1f}{t_cube_read * 1000:>9.1f}")
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+from cleaning_pipeline import (
+    RAW_DIR, build_records, prepare_file, reconstruct_sentence_spans
+)
+from corpus_io import list_corpus
+from sentence_segmenter import iter_sentence_spans, load_sentencizer
+
+REPEAT = 3
+SCALE = int(sys.argv[1]) if len(sys.argv) > 1 else 1   # corpus copies
+
+# Sentence splitting of raw_txt (after cleaning and table removal):
+#   heuristic      -> reconstruct_sentence_spans, line ends only
+#   spacy xN       -> sentencizer through nlp.pipe with N processes
+# Throughput is MB/s of cleaned text; the sentence and claim counts
+# are for one copy of the corpus.
+
+
+def segment(docs, backend, n_process=1):
+    items = (((d["lines"], d["breaks"]), d) for d in docs)
+    if backend == "heuristic":
+        return [(reconstruct_sentence_spans(l, b), d) for (l, b), d in items]
+    return list(iter_sentence_spans(items, n_process=n_process))
+
+
+def timed(docs, backend, n_process=1):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        result = segment(docs, backend, n_process)
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+docs = [
+    prepare_file(os.path.join(RAW_DIR, f))
+    for f in list_corpus(RAW_DIR, formats=(".txt",))
+]
+load_sentencizer()
+
+mb = SCALE * sum(len(d["text"]) for d in docs) / 1e6
+print(f"{len(docs)} documents x{SCALE}, {mb:.1f} MB cleaned text\n")
+print(f"{'backend':<14}{'MB/s':>8}{'sentences':>11}{'claims':>8}{'<30 chars':>11}")
+
+runs = [("heuristic", 1), ("spacy", 1)]
+runs += [("spacy", n) for n in (2, 4) if n <= (os.cpu_count() or 1)]
+
+for backend, n_process in runs:
+    result, t = timed(docs * SCALE, backend, n_process)
+    result = result[:len(docs)]
+
+    sentences = sum(len(spans) for spans, _ in result)
+    short = sum(e - s < 30 for spans, _ in result for s, e in spans)
+    claims = sum(len(build_records(d, spans)) for spans, d in result)
+
+    name = backend if backend == "heuristic" else f"spacy x{n_process}"
+    print(f"{name:<14}{mb / t:>8.2f}{sentences:>11}{claims:>8}{short:>11}")
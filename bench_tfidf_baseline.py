@@ -0,0 +1,100 @@
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import subprocess
+
+import tfidf_baseline
+from corpus_io import write_records
+
+SCALES = [1, 10, 100]    # copies of the labelled corpus
+
+# Peak memory and throughput of the in-memory notebook fit
+# (TfidfVectorizer 8000 features + LogisticRegression) against the
+# streamed hashing + partial_fit training, each in a fresh process.
+# Both are scored on the same hash-selected holdout. Scaled corpora are
+# repeated copies, so their F1 says nothing about quality on new data.
+
+
+def run_in_memory(path):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import f1_score
+
+    examples = list(tfidf_baseline.iter_examples([path]))
+    train = [(s, y) for s, y in examples if not tfidf_baseline.is_holdout(s)]
+    test = [(s, y) for s, y in examples if tfidf_baseline.is_holdout(s)]
+
+    vectorizer = TfidfVectorizer(
+        max_features=8000,
+        ngram_range=(1, 2),
+        stop_words="english"
+    )
+    X_train = vectorizer.fit_transform([s for s, _ in train])
+    model = LogisticRegression(class_weight="balanced", max_iter=1000)
+    model.fit(X_train, [y for _, y in train])
+
+    y_pred = model.predict(vectorizer.transform([s for s, _ in test]))
+    return len(examples), f1_score([y for _, y in test], y_pred, average="macro")
+
+
+def run_streaming(path):
+    from sklearn.metrics import f1_score
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model, _ = tfidf_baseline.fit([path], os.path.join(tmp, "model.joblib"))
+
+    n = 0
+    y_true, y_pred = [], []
+    for side, sentences, labels in tfidf_baseline.iter_chunks(tfidf_baseline.iter_examples([path])):
+        n += len(sentences)
+        if side == "test":
+            y_true.extend(labels)
+            y_pred.extend(model.predict(sentences))
+    return n, f1_score(y_true, y_pred, average="macro")
+
+
+def child(method, path):
+    t0 = time.perf_counter()
+    n, f1 = (run_in_memory if method == "memory" else run_streaming)(path)
+    elapsed = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"rows": n, "seconds": elapsed, "peak_mb": peak_mb, "f1": f1}))
+
+
+def main():
+    rows = [
+        {"sentence": s, "category": c, "has_metric": m}
+        for s, c, m in (
+            (r["sentence"], r["category"], r["has_metric"])
+            for path in tfidf_baseline.iter_paths(tfidf_baseline.SOURCES)
+            for r in map(tfidf_baseline.materialize, tfidf_baseline.read_records(path))
+        )
+    ]
+
+    print(f"{'rows':>8}{'method':>11}{'peak MB':>10}{'rows/s':>10}{'macro F1':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in SCALES:
+            path = os.path.join(tmp, f"corpus_x{scale}.jsonl")
+            write_records(path, (r for _ in range(scale) for r in rows))
+
+            for method in ("memory", "streaming"):
+                out = subprocess.run(
+                    [sys.executable, __file__, method, path],
+                    capture_output=True, text=True, check=True
+                ).stdout.strip().splitlines()[-1]
+                r = json.loads(out)
+                print(
+                    f"{r['rows']:>8}{method:>11}{r['peak_mb']:>10.0f}"
+                    f"{r['rows'] / r['seconds']:>10.0f}{r['f1']:>10.3f}"
+                )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        child(sys.argv[1], sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,116 @@
+import glob
+import os
+import re
+import time
+
+import junk_rules
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RAW_DIR = os.path.join(BASE_DIR, "raw_txt")
+REPEAT = 5
+
+# Parity of junk_rules.clean_line with the per-rule implementation it
+# replaced, over every line of raw_txt (and over its page-marker
+# prefixes, which process_file cleans separately) plus a few lines where
+# the rules overlap, then lines/s of both.
+
+
+# ---------- previous implementation ----------
+SECTION_HEADERS = [
+    r"^[A-Z\s&/]{6,}$",
+    r"^CONTENTS?$",
+    r"^INTRODUCTION$",
+    r"^GOVERNANCE$",
+    r"^PERFORMANCE$",
+]
+
+
+def is_junk_line(line):
+    line = line.strip()
+    if not line:
+        return True
+    for pat in SECTION_HEADERS:
+        if re.match(pat, line):
+            return True
+    return False
+
+
+def remove_inline_junk(text):
+    text = re.sub(r"---\s*PAGE\s*\d+\s*---", " ", text, flags=re.I)
+    text = re.sub(r"\bPAGE\s*\d+\b", " ", text, flags=re.I)
+    text = re.sub(r"\b\d+\s*(?=PAGE)", " ", text)
+    text = re.sub(r"-{2,}", " ", text)
+    return text.strip()
+
+
+def normalize_text(text):
+    text = text.replace("CO₂", "CO2")
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def old_clean_line(line):
+    if is_junk_line(line):
+        return ""
+    return normalize_text(remove_inline_junk(line))
+
+
+# ---------- parity ----------
+lines = []
+for path in sorted(glob.glob(os.path.join(RAW_DIR, "*.txt"))):
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        lines.extend(f.readlines())
+
+# page-marker prefixes, as cleaned in process_file
+fragments = [
+    line[:m.start()]
+    for line in lines
+    for m in re.finditer(r"---\s*PAGE\s*\d+\s*---", line, re.I)
+]
+
+mismatches = 0
+for line in lines:
+    if old_clean_line(line) != junk_rules.clean_line(line):
+        mismatches += 1
+        if mismatches <= 5:
+            print("❌ line:", repr(line[:120]))
+for text in fragments:
+    if normalize_text(remove_inline_junk(text)) != junk_rules.strip_junk(text):
+        mismatches += 1
+        if mismatches <= 5:
+            print("❌ fragment:", repr(text[:120]))
+
+# rules that overlap, where only the per-rule order gives the old output
+cases = [
+    "Report 12 PAGE 3 text",
+    "Scope 1 --- PAGE 4 --- emissions",
+    "Revenue 2021 Page 7 -- see note",
+    "12PAGE 3",
+]
+for text in cases:
+    if normalize_text(remove_inline_junk(text)) != junk_rules.strip_junk(text):
+        mismatches += 1
+        print("❌ case:", repr(text), "->", repr(junk_rules.strip_junk(text)))
+
+print(
+    f"Lines: {len(lines)}, page-marker prefixes: {len(fragments)}, "
+    f"cases: {len(cases)}"
+)
+print("✅ parity" if not mismatches else f"❌ {mismatches} mismatches")
+
+
+# ---------- throughput ----------
+def best_of(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+t_old = best_of(old_clean_line)
+t_new = best_of(junk_rules.clean_line)
+print(f"per-rule:  {len(lines) / t_old:>10.0f} lines/s")
+print(f"junk_rules:{len(lines) / t_new:>10.0f} lines/s  ({t_old / t_new:.1f}x)")
@@ -0,0 +1,48 @@
+# ==============================
+# ROLE BITMASK
+# ==============================
+#
+# One bit per claim role. A clause matching several roles is stored once
+# with the OR of its bits (atomic_pipeline/atomic_extractor.py), and
+# every stage that reads the "roles" field decodes it with these.
+
+ROLES = ["metric", "vision", "action", "governance", "marketing"]
+
+ROLE_BITS = {role: 1 << i for i, role in enumerate(ROLES)}
+
+
+def mask_to_roles(mask):
+    return [role for role, bit in ROLE_BITS.items() if mask & bit]
+
+
+def row_role_mask(row):
+    """
+    Role bitmask of a row; rows written before the bitmask existed
+    only carry a single category.
+    """
+    if "roles" in row:
+        return int(row["roles"])
+    return ROLE_BITS.get(row.get("category"), 0)
+
+
+# ==============================
+# WEAK LABELS
+# ==============================
+#
+# Weak greenwashing label of a clause (app.ipynb, tfidf_baseline.py):
+# the first role in WEAK_LABEL_PRIORITY the clause has. Before the
+# bitmask a multi-role clause was stored once per role, and its
+# vision / action copy (has_metric False) got 2 / 1; the most severe
+# label of those copies is kept.
+#   2 -> vision (aspiration)    1 -> action    0 -> anything else
+
+WEAK_LABEL_PRIORITY = [("vision", 2), ("action", 1)]
+DEFAULT_WEAK_LABEL = 0
+
+
+def weak_label(mask):
+    mask = int(mask)
+    for role, label in WEAK_LABEL_PRIORITY:
+        if mask & ROLE_BITS[role]:
+            return label
+    return DEFAULT_WEAK_LABEL
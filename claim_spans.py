@@ -0,0 +1,167 @@
+import os
+import json
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+from corpus_io import corpus_name
+
+# ==============================
+# CONFIG
+# ==============================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CLEANED_TEXT_DIR = os.path.join(BASE_DIR, "cleaned_text")
+
+
+# ==============================
+# DOCUMENT METADATA
+# ==============================
+
+def extract_company_year(filename):
+    base = corpus_name(filename).replace(".txt", "")
+    tokens = base.split("_")
+
+    year = None
+    company_tokens = []
+
+    for t in tokens:
+        if re.fullmatch(r"(19|20)\d{2}", t):
+            year = int(t)
+        elif not t.isdigit():
+            company_tokens.append(t)
+
+    company = "_".join(company_tokens).upper() if company_tokens else "UNKNOWN"
+    return company, year
+
+
+# ==============================
+# DOCUMENT STORE
+# ==============================
+#
+# A claim record is (doc_id, page, start, end) into the cleaned text of its
+# document. The cleaned text, company and year are stored once per document;
+# the sentence string is only built when a record is written out.
+
+def save_document(doc_id, company, year, text, pages, tables=(), out_dir=CLEANED_TEXT_DIR):
+    """
+    pages:  [(offset, page_number), ...] in offset order.
+    tables: [(page_number, text), ...] table/figure text cut out of text.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    doc = {
+        "doc_id": doc_id,
+        "company": company,
+        "year": year,
+        "text": text,
+        "pages": [list(p) for p in pages],
+        "tables": [list(t) for t in tables]
+    }
+
+    with open(os.path.join(out_dir, doc_id + ".json"), "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False)
+
+
+@lru_cache(maxsize=32)
+def load_document(doc_id, doc_dir=CLEANED_TEXT_DIR):
+    with open(os.path.join(doc_dir, doc_id + ".json"), encoding="utf-8") as f:
+        doc = json.load(f)
+
+    doc["page_offsets"] = [p[0] for p in doc["pages"]]
+    return doc
+
+
+def page_at(doc, offset):
+    i = bisect_right(doc["page_offsets"], offset)
+    return doc["pages"][i - 1][1] if i else None
+
+
+# ==============================
+# SPAN HELPERS
+# ==============================
+
+def strip_span(text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def split_span(text, start, end, pattern):
+    """
+    Span equivalent of re.split(pattern, text[start:end]) with every
+    part stripped.
+    """
+    parts = []
+    pos = start
+
+    for m in pattern.finditer(text, start, end):
+        parts.append(strip_span(text, pos, m.start()))
+        pos = m.end()
+
+    parts.append(strip_span(text, pos, end))
+    return parts
+
+
+# ==============================
+# RECORDS
+# ==============================
+
+def resolve(row):
+    """
+    (text, start, end) of a record. Rows written before spans existed
+    carry their own sentence string.
+    """
+    if "doc_id" in row:
+        doc = load_document(row["doc_id"])
+        return doc["text"], row["start"], row["end"]
+
+    sentence = re.sub(r"\s+", " ", row["sentence"]).strip()
+    return sentence, 0, len(sentence)
+
+
+def derive(row, text, start, end, **fields):
+    """
+    New record for text[start:end], where text came from resolve(row).
+    """
+    if "doc_id" in row:
+        doc = load_document(row["doc_id"])
+        record = {
+            "doc_id": row["doc_id"],
+            "page": page_at(doc, start),
+            "start": start,
+            "end": end
+        }
+    else:
+        record = {
+            "company": row["company"],
+            "year": row["year"],
+            "sentence": text[start:end]
+        }
+
+    record.update(fields)
+    return record
+
+
+def materialize(row):
+    """
+    Output form of a record: company, year and sentence filled in,
+    doc_id and page kept so the claim can be traced to its page.
+    """
+    if "doc_id" not in row:
+        return dict(row)
+
+    doc = load_document(row["doc_id"])
+    out = {
+        "company": doc["company"],
+        "year": doc["year"],
+        "sentence": doc["text"][row["start"]:row["end"]]
+    }
+
+    for k, v in row.items():
+        if k not in ("start", "end"):
+            out[k] = v
+
+    return out
@@ -0,0 +1,370 @@
+import os
+import hashlib
+import sqlite3
+
+import risk_cube
+from claim_spans import extract_company_year, materialize
+from corpus_io import list_corpus, read_records
+
+# ==============================
+# CONFIG
+# ==============================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "claims.db")
+
+# Pipeline outputs loaded by `python claim_store.py`
+SOURCES = [
+    os.path.join(BASE_DIR, "Refinement", "output_jsonl"),
+    os.path.join(BASE_DIR, "atomic_pipeline", "output_atomic_jsonl"),
+    os.path.join(BASE_DIR, "combined_esg_labeled.csv"),
+]
+
+BATCH_SIZE = 5_000
+
+# Seconds a writer waits for another connection's transaction (each app
+# session has its own connection) before "database is locked"
+BUSY_TIMEOUT = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    id           INTEGER PRIMARY KEY,
+    claim_key    TEXT UNIQUE NOT NULL,
+    company      TEXT,
+    year         INTEGER,
+    category     TEXT,
+    roles        INTEGER,
+    has_metric   INTEGER,
+    label        INTEGER,
+    probability  REAL,
+    high_risk    INTEGER,
+    doc_id       TEXT,
+    page         INTEGER,
+    source       TEXT,
+    sentence     TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_claims_company_year ON claims(company, year);
+CREATE INDEX IF NOT EXISTS idx_claims_year ON claims(year);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS claims_fts USING fts5(
+    sentence, content='claims', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS claims_ai AFTER INSERT ON claims BEGIN
+    INSERT INTO claims_fts(rowid, sentence) VALUES (new.id, new.sentence);
+END;
+
+CREATE TRIGGER IF NOT EXISTS claims_ad AFTER DELETE ON claims BEGIN
+    INSERT INTO claims_fts(claims_fts, rowid, sentence)
+    VALUES ('delete', old.id, old.sentence);
+END;
+
+-- distinct companies / years / categories for the filter widgets
+CREATE TABLE IF NOT EXISTS facets (
+    kind   TEXT NOT NULL,
+    value  TEXT NOT NULL,
+    PRIMARY KEY (kind, value)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS claims_facets AFTER INSERT ON claims BEGIN
+    INSERT OR IGNORE INTO facets
+    SELECT 'company', new.company WHERE new.company IS NOT NULL
+    UNION ALL SELECT 'year', new.year WHERE new.year IS NOT NULL
+    UNION ALL SELECT 'category', new.category WHERE new.category IS NOT NULL;
+END;
+
+CREATE TABLE IF NOT EXISTS sources (
+    source  TEXT PRIMARY KEY,
+    mtime   REAL,
+    size    INTEGER,
+    rows    INTEGER
+);
+"""
+
+# Re-loading a claim keeps whatever it already had unless the new row
+# brings a value (e.g. a model score from an app run).
+UPSERT = """
+INSERT INTO claims (
+    claim_key, company, year, category, roles, has_metric,
+    label, probability, high_risk, doc_id, page, source, sentence
+) VALUES (
+    :claim_key, :company, :year, :category, :roles, :has_metric,
+    :label, :probability, :high_risk, :doc_id, :page, :source, :sentence
+)
+ON CONFLICT(claim_key) DO UPDATE SET
+    category    = COALESCE(excluded.category, category),
+    roles       = COALESCE(excluded.roles, roles),
+    has_metric  = COALESCE(excluded.has_metric, has_metric),
+    label       = COALESCE(excluded.label, label),
+    probability = COALESCE(excluded.probability, probability),
+    high_risk   = COALESCE(excluded.high_risk, high_risk),
+    doc_id      = COALESCE(excluded.doc_id, doc_id),
+    page        = COALESCE(excluded.page, page)
+"""
+
+COLUMNS = [
+    "company", "year", "category", "roles", "has_metric",
+    "label", "probability", "high_risk", "doc_id", "page", "source", "sentence"
+]
+
+
+# ==============================
+# CONNECTION
+# ==============================
+
+def connect(db_path=DB_PATH):
+    """
+    New connection to the store. Connections are not shared between
+    threads that write concurrently; open one per app session.
+    """
+    # a session's script runs may hop threads, never overlap
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    risk_cube.install(conn)
+    return conn
+
+
+# ==============================
+# WRITE
+# ==============================
+
+def claim_key(company, year, sentence):
+    raw = f"{company}|{year}|{sentence.lower()}"
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def _int(v):
+    return None if v is None or v == "" else int(v)
+
+
+def _to_params(row, source):
+    sentence = row["sentence"]
+    params = {c: row.get(c) for c in COLUMNS}
+
+    params["claim_key"] = claim_key(row["company"], row["year"], sentence)
+    params["source"] = source
+    for c in ("year", "roles", "label", "page"):
+        params[c] = _int(params[c])
+    for c in ("has_metric", "high_risk"):
+        if params[c] is not None:
+            params[c] = int(bool(params[c]))
+
+    return params
+
+
+def _upsert_claims(conn, rows, source):
+    """
+    Upsert claim rows and refresh the risk cube cells of the scored
+    company-years, in the caller's transaction (no commit).
+    Returns the number of rows written.
+    """
+    n = 0
+    batch = []
+    scored = set()   # company-years whose risk cube cells need a refresh
+
+    for row in rows:
+        params = _to_params(row, source)
+        if params["probability"] is not None:
+            scored.add((params["company"], params["year"]))
+        batch.append(params)
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(UPSERT, batch)
+            n += len(batch)
+            batch = []
+
+    if batch:
+        conn.executemany(UPSERT, batch)
+        n += len(batch)
+
+    for company, year in scored:
+        risk_cube.refresh(conn, company, year)
+
+    return n
+
+
+def add_claims(conn, rows, source):
+    """
+    Upsert materialized claim rows (company, year, sentence, ...) in one
+    transaction. Returns the number of rows written.
+    """
+    with conn:
+        return _upsert_claims(conn, rows, source)
+
+
+def add_scored_report(conn, name, df):
+    """
+    Store one app-scored report; df has sentence, probability,
+    high_risk and optionally category.
+    Replaces the scores of any earlier run on the same company-year,
+    whose claims may have been split into different sentences; clearing,
+    upserting and the risk cube refresh are one transaction.
+    """
+    company, year = extract_company_year(name)
+    rows = (
+        {
+            "company": company,
+            "year": year,
+            "sentence": r["sentence"],
+            "probability": float(r["probability"]),
+            "high_risk": bool(r["high_risk"]),
+            "category": r.get("category"),
+        }
+        for r in df.to_dict("records")
+    )
+
+    with conn:
+        conn.execute(
+            "UPDATE claims SET probability = NULL, high_risk = NULL"
+            " WHERE company IS ? AND year IS ? AND probability IS NOT NULL",
+            (company, year)
+        )
+        n = _upsert_claims(conn, rows, source=f"app:{name}")
+        if not n:
+            risk_cube.refresh(conn, company, year)
+
+    return n
+
+
+def _file_on_disk(path):
+    marker = ".zip/"
+    i = path.lower().find(marker)
+    return path[:i + 4] if i != -1 else path
+
+
+def ingest_file(conn, path):
+    """
+    Load one pipeline output file unless it is unchanged since the last
+    load. A changed file replaces the claims it loaded before, except
+    those scored in the app since. Returns the number of rows written
+    (0 when skipped).
+    """
+    st = os.stat(_file_on_disk(path))
+    # sources and claims.source share this key (file names repeat
+    # across pipeline stages)
+    source = os.path.relpath(path, BASE_DIR)
+
+    seen = conn.execute(
+        "SELECT mtime, size FROM sources WHERE source = ?", (source,)
+    ).fetchone()
+    if seen and seen["mtime"] == st.st_mtime and seen["size"] == st.st_size:
+        return 0
+
+    with conn:
+        conn.execute(
+            "DELETE FROM claims WHERE source = ? AND probability IS NULL",
+            (source,)
+        )
+        n = _upsert_claims(
+            conn, (materialize(r) for r in read_records(path)), source
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+            (source, st.st_mtime, st.st_size, n)
+        )
+    return n
+
+
+def ingest(conn, sources=SOURCES):
+    total = 0
+    for src in sources:
+        if os.path.isdir(src):
+            paths = [os.path.join(src, f) for f in list_corpus(src)]
+        elif os.path.exists(src):
+            paths = [src]
+        else:
+            continue
+
+        for path in paths:
+            n = ingest_file(conn, path)
+            if n:
+                print(f"🗄️ {os.path.relpath(path, BASE_DIR)}: {n} claims")
+            total += n
+
+    return total
+
+
+# ==============================
+# QUERY
+# ==============================
+
+def _fts_query(keyword):
+    # every word must appear; quotes keep FTS operators out of user input
+    terms = keyword.split()
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def search(conn, keyword=None, company=None, year=None, category=None,
+           high_risk_only=False, limit=200):
+    where = []
+    params = []
+
+    if keyword and keyword.strip():
+        where.append("c.id IN (SELECT rowid FROM claims_fts WHERE claims_fts MATCH ?)")
+        params.append(_fts_query(keyword))
+    if company:
+        where.append("c.company = ?")
+        params.append(company)
+    if year:
+        where.append("c.year = ?")
+        params.append(int(year))
+    if category:
+        where.append("c.category = ?")
+        params.append(category)
+    if high_risk_only:
+        where.append("c.high_risk = 1")
+
+    sql = "SELECT " + ", ".join("c." + col for col in COLUMNS) + " FROM claims c"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY c.id LIMIT ?"
+    params.append(limit)
+
+    return [dict(r) for r in conn.execute(sql, params)]
+
+
+def company_claims(conn, company, year):
+    return [dict(r) for r in conn.execute(
+        "SELECT sentence, probability FROM claims WHERE company = ? AND year = ? ORDER BY id",
+        (company, int(year))
+    )]
+
+
+def scored_claims(conn, company, year):
+    """
+    Claims of the latest scoring of company-year; add_scored_report
+    clears the scores of earlier runs.
+    """
+    return [dict(r) for r in conn.execute(
+        "SELECT sentence, probability FROM claims"
+        " WHERE company = ? AND year = ? AND probability IS NOT NULL ORDER BY id",
+        (company, int(year))
+    )]
+
+
+def previous_scored_year(conn, company, year):
+    row = conn.execute(
+        "SELECT MAX(year) FROM claims"
+        " WHERE company = ? AND year < ? AND probability IS NOT NULL",
+        (company, int(year))
+    ).fetchone()
+    return row[0]
+
+
+def facets(conn):
+    values = {"company": [], "year": [], "category": []}
+    for kind, value in conn.execute("SELECT kind, value FROM facets ORDER BY kind, value"):
+        values[kind].append(value)
+
+    years = sorted(int(y) for y in values["year"])
+    return values["company"], years, values["category"]
+
+
+if __name__ == "__main__":
+    conn = connect()
+    total = ingest(conn)
+    count = conn.execute("SELECT COUNT(*) FROM claims").fetchone()[0]
+    print(f"✅ {total} claims loaded, {count} in store")
@@ -1,28 +1,28 @@
 import os
-import json
 import re
 
+from claim_spans import extract_company_year, save_document
+from corpus_io import JSONL, corpus_name, list_corpus, open_text, write_records
+from junk_rules import clean_line, strip_junk
+from sentence_segmenter import HEURISTIC, SPACY, iter_sentence_spans
+from table_regions import strip_tables
+
 # ==============================
 # CONFIG
 # ==============================
 
 RAW_DIR = "raw_txt"
 OUT_DIR = "cleaned_jsonl"
-os.makedirs(OUT_DIR, exist_ok=True)
+OUT_FORMAT = JSONL   # or corpus_io.PARQUET / corpus_io.ARROW
+OUT_COMPRESSION = ""   # "", ".gz", ".zst" or ".zip" (JSONL/CSV only)
 
-# ---------- HARD JUNK PATTERNS ----------
-PAGE_PATTERNS = [
-    r"---\s*PAGE\s*\d+\s*---",
-    r"\bPAGE\s*\d+\b"
-]
+# HEURISTIC: a sentence ends at a line ending in . ! or ?
+# SPACY: spaCy sentencizer over all files in one multi-process stream
+# (sentence_segmenter.py)
+SENTENCE_BACKEND = HEURISTIC
 
-SECTION_HEADERS = [
-    r"^[A-Z\s&/]{6,}$",     # ALL CAPS headers
-    r"^CONTENTS?$",
-    r"^INTRODUCTION$",
-    r"^GOVERNANCE$",
-    r"^PERFORMANCE$",
-]
+# Junk rules (page markers, headers, separators) live in junk_rules.py
+PAGE_MARKER = re.compile(r"---\s*PAGE\s*(\d+)\s*---", re.I)
 
 # ---------- ESG KEYWORDS ----------
 ENV_KEYWORDS = [
@@ -38,68 +38,33 @@ METRIC_PATTERN = re.compile(
 
 YEAR_PATTERN = re.compile(r"\b(19|20)\d{2}\b")
 
-
-# ==============================
-# JUNK REMOVAL
-# ==============================
-
-def is_junk_line(line: str) -> bool:
-    line = line.strip()
-    if not line:
-        return True
-
-    for pat in SECTION_HEADERS:
-        if re.match(pat, line):
-            return True
-
-    return False
-
-
-def remove_inline_junk(text: str) -> str:
-    # Remove PAGE markers anywhere in line
-    text = re.sub(r"---\s*PAGE\s*\d+\s*---", " ", text, flags=re.I)
-    text = re.sub(r"\bPAGE\s*\d+\b", " ", text, flags=re.I)
-
-    # Remove standalone page numbers before PAGE markers
-    text = re.sub(r"\b\d+\s*(?=PAGE)", " ", text)
-
-    # Remove leftover dashed separators
-    text = re.sub(r"-{2,}", " ", text)
-
-    return text.strip()
-
-
-def normalize_text(text: str) -> str:
-    text = text.replace("CO₂", "CO2")
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+MIN_SENTENCE_LEN = 30
+MAX_SENTENCE_LEN = 400
 
 
 # ==============================
 # SENTENCE RECONSTRUCTION
 # ==============================
 
-def reconstruct_sentences(lines):
-    sentences = []
-    buffer = ""
+def reconstruct_sentence_spans(lines, breaks=()):
+    """
+    Sentences as (start, end) offsets into " ".join(lines): lines are
+    joined until one ends in ".", "!" or "?". A sentence also ends after
+    every line index in breaks, and after the last line.
+    """
+    spans = []
+    start = pos = 0
 
-    for line in lines:
-        line = normalize_text(line)
+    for i, line in enumerate(lines):
+        end = pos + len(line)
 
-        if not buffer:
-            buffer = line
-            continue
-
-        if re.search(r"[.!?]$", buffer):
-            sentences.append(buffer)
-            buffer = line
-        else:
-            buffer += " " + line
+        if re.search(r"[.!?]$", line) or i in breaks or i == len(lines) - 1:
+            spans.append((start, end))
+            start = end + 1
 
-    if buffer:
-        sentences.append(buffer)
+        pos = end + 1
 
-    return sentences
+    return spans
 
 
 # ==============================
@@ -140,58 +105,150 @@ def classify_sentence(sentence: str) -> str:
     return "other"
 
 
-# ==============================
-# FILE METADATA
-# ==============================
-
-def extract_company_year(filename):
-    base = os.path.basename(filename).replace(".txt", "")
-    tokens = base.split("_")
-
-    year = None
-    company_tokens = []
-
-    for t in tokens:
-        if re.fullmatch(r"(19|20)\d{2}", t):
-            year = int(t)
-        elif not t.isdigit():
-            company_tokens.append(t)
-
-    company = "_".join(company_tokens).upper() if company_tokens else "UNKNOWN"
-    return company, year
-
-
 # ==============================
 # MAIN PIPELINE
 # ==============================
 
-def process_file(path):
+def _stripped_offset(pieces, offset):
+    """
+    Offset into " ".join(pieces) of position offset in the unstripped line.
+    """
+    pos = 0
+    for s, e in pieces:
+        if offset <= s:
+            return pos
+        if offset < e:
+            return pos + offset - s
+        pos += e - s + 1
+    return max(pos - 1, 0)
+
+
+def table_report(lines, regions):
+    """
+    How much of a document the table regions took, counted on the
+    sentences it would have had without table removal.
+
+    lines:   cleaned lines before table removal
+    regions: (start, end) of every removed region in " ".join(lines)
+    """
+    touched = dropped = 0
+    r = 0
+
+    for start, end in reconstruct_sentence_spans(lines):
+        while r < len(regions) and regions[r][1] <= start:
+            r += 1
+
+        overlap = 0
+        j = r
+        while j < len(regions) and regions[j][0] < end:
+            overlap += min(end, regions[j][1]) - max(start, regions[j][0])
+            j += 1
+
+        if overlap:
+            touched += 1
+            if end - start - overlap < MIN_SENTENCE_LEN:
+                dropped += 1
+
+    return {
+        "table_regions": len(regions),
+        "table_chars": sum(e - s for s, e in regions),
+        "sentences_trimmed": touched - dropped,
+        "sentences_removed": dropped
+    }
+
+
+def prepare_file(path):
+    """
+    Clean one raw text file and save its document.
+    Returns a dict with what sentence splitting and build_records need.
+    """
     company, year = extract_company_year(path)
+    doc_id = os.path.splitext(corpus_name(path))[0]
 
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+    with open_text(path) as f:
         raw_lines = f.readlines()
 
     cleaned_lines = []
+    breaks = set()
+    pages = []
+    pos = 0
 
-    for line in raw_lines:
-        if is_junk_line(line):
-            continue
-
-        line = remove_inline_junk(line)
-        line = normalize_text(line)
+    # table regions, cut out of the lines before sentence reconstruction
+    tables = []
+    full_lines = []
+    full_regions = []
+    full_pos = 0
 
-        if line:
-            cleaned_lines.append(line)
-
-    sentences = reconstruct_sentences(cleaned_lines)
+    for line in raw_lines:
+        line_clean = clean_line(line)
+        pieces, regions = strip_tables(line_clean)
+
+        # Page boundaries as offsets into the cleaned text
+        page = pages[-1][1] if pages else None
+        line_pages = []
+        for m in PAGE_MARKER.finditer(line):
+            local = 0
+            if line_clean:
+                prefix = strip_junk(line[:m.start()])
+                if prefix:
+                    local = min(len(prefix) + 1, len(line_clean))
+            line_pages.append((local, int(m.group(1))))
+            pages.append((pos + _stripped_offset(pieces, local), int(m.group(1))))
+
+        for start, end in regions:
+            for local, n in line_pages:
+                if local <= start:
+                    page = n
+            tables.append([page, line_clean[start:end]])
+            full_regions.append((full_pos + start, full_pos + end))
+
+        if line_clean:
+            full_lines.append(line_clean)
+            full_pos += len(line_clean) + 1
+
+        # A table region always ends the sentence before it
+        k = 0
+        for start, end in pieces:
+            while k < len(regions) and regions[k][0] < start:
+                if cleaned_lines:
+                    breaks.add(len(cleaned_lines) - 1)
+                k += 1
+            piece = line_clean[start:end]
+            cleaned_lines.append(piece)
+            pos += len(piece) + 1
+        if k < len(regions) and cleaned_lines:
+            breaks.add(len(cleaned_lines) - 1)
+
+    text = " ".join(cleaned_lines)
+    save_document(doc_id, company, year, text, pages, tables=tables)
+
+    return {
+        "doc_id": doc_id,
+        "text": text,
+        "lines": cleaned_lines,
+        "breaks": breaks,
+        "pages": pages,
+        "tables": table_report(full_lines, full_regions)
+    }
+
+
+def build_records(doc, spans):
+    """
+    Claim records of a prepared document from its sentence spans.
+    """
+    doc_id, text, pages = doc["doc_id"], doc["text"], doc["pages"]
 
     records = []
     seen = set()
+    page_idx = 0
 
-    for sent in sentences:
-        sent = normalize_text(sent)
+    for start, end in spans:
+        sent = text[start:end]
 
-        if len(sent) < 30 or len(sent) > 400:
+        while page_idx < len(pages) and pages[page_idx][0] <= start:
+            page_idx += 1
+
+        if len(sent) < MIN_SENTENCE_LEN or len(sent) > MAX_SENTENCE_LEN:
             continue
 
         key = sent.lower()
@@ -206,9 +263,10 @@ def process_file(path):
             continue
 
         record = {
-            "company": company,
-            "year": year,
-            "sentence": sent,
+            "doc_id": doc_id,
+            "page": pages[page_idx - 1][1] if page_idx else None,
+            "start": start,
+            "end": end,
             "category": classify_sentence(sent),
             "has_metric": metric,
             "env_relevant": env
@@ -219,27 +277,65 @@ def process_file(path):
     return records
 
 
+def iter_processed(paths, backend=SENTENCE_BACKEND):
+    """
+    (path, records, table_report) for every path, in order.
+    """
+    items = (
+        ((doc["lines"], doc["breaks"]), (path, doc))
+        for path in paths
+        for doc in [prepare_file(path)]
+    )
+
+    if backend == SPACY:
+        segmented = iter_sentence_spans(items)
+    elif backend == HEURISTIC:
+        segmented = (
+            (reconstruct_sentence_spans(lines, breaks), context)
+            for (lines, breaks), context in items
+        )
+    else:
+        raise ValueError(f"Unknown sentence backend: {backend}")
+
+    for spans, (path, doc) in segmented:
+        yield path, build_records(doc, spans), doc["tables"]
+
+
+def process_file(path, backend=SENTENCE_BACKEND):
+    for _, records, tables in iter_processed([path], backend):
+        return records, tables
+
+
 # ==============================
 # RUN ALL FILES
 # ==============================
 
 def run_all():
-    for fname in os.listdir(RAW_DIR):
-        if not fname.endswith(".txt"):
-            continue
+    os.makedirs(OUT_DIR, exist_ok=True)
 
-        path = os.path.join(RAW_DIR, fname)
-        records = process_file(path)
+    # raw text may be plain, .gz, .zst or inside a .zip archive
+    paths = [
+        os.path.join(RAW_DIR, fname)
+        for fname in list_corpus(RAW_DIR, formats=(".txt",))
+    ]
+
+    for path, records, tables in iter_processed(paths):
+        fname = os.path.basename(path)
 
         out_path = os.path.join(
-            OUT_DIR, fname.replace(".txt", ".jsonl")
+            OUT_DIR,
+            corpus_name(fname).replace(".txt", OUT_FORMAT) + OUT_COMPRESSION
         )
 
-        with open(out_path, "w", encoding="utf-8") as f:
-            for r in records:
-                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        write_records(out_path, records)
 
         print(f"✅ {fname}: {len(records)} clean sentences")
+        print(
+            f"   🧮 tables: {tables['table_regions']} regions, "
+            f"{tables['table_chars']} chars, "
+            f"{tables['sentences_removed']} sentences removed, "
+            f"{tables['sentences_trimmed']} trimmed"
+        )
 
 
 if __name__ == "__main__":
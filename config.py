@@ -1,19 +1,8 @@
 import re
 
 # ---------- HARD JUNK PATTERNS ----------
-PAGE_PATTERNS = [
-    r"---\s*PAGE\s*\d+\s*---",
-    r"^\s*PAGE\s*\d+",
-    r"^\s*\d+\s*$"
-]
-
-SECTION_HEADERS = [
-    r"^[A-Z\s&]{6,}$",            # ALL CAPS headers
-    r"^Contents$",
-    r"^Introduction$",
-    r"^Governance$",
-    r"^Performance$"
-]
+# One compiled rule set shared by both pipelines
+from junk_rules import PAGE_PATTERNS, SECTION_HEADERS, SEPARATORS
 
 TABLE_NOISE = [
     r"\bFY\s?\d{4}[-–]\d{2}\b",
@@ -0,0 +1,320 @@
+import os
+import io
+import csv
+import gzip
+import json
+import zipfile
+from contextlib import contextmanager
+
+import zstandard
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+# ==============================
+# CONFIG
+# ==============================
+
+JSONL = ".jsonl"
+CSV = ".csv"
+PARQUET = ".parquet"
+ARROW = ".arrow"
+
+SUPPORTED_FORMATS = (JSONL, CSV, PARQUET, ARROW)
+
+GZIP = ".gz"
+ZSTD = ".zst"
+ZIP = ".zip"
+
+COMPRESSIONS = (GZIP, ZSTD, ZIP)
+
+BATCH_SIZE = 10_000
+
+_DICT_STR = pa.dictionary(pa.int32(), pa.string())
+
+# Every claim record fits this schema: span rows leave company/sentence
+# empty, materialized rows leave start/end empty.
+CLAIM_SCHEMA = pa.schema([
+    ("doc_id", _DICT_STR),
+    ("page", pa.int32()),
+    ("start", pa.int32()),
+    ("end", pa.int32()),
+    ("company", _DICT_STR),
+    ("year", pa.int16()),
+    ("sentence", pa.string()),
+    ("category", _DICT_STR),
+    ("roles", pa.uint8()),
+    ("has_metric", pa.bool_()),
+    ("env_relevant", pa.bool_()),
+    ("source_file", _DICT_STR),
+    ("label", pa.int8()),
+    ("probability", pa.float64()),
+    ("high_risk", pa.bool_()),
+])
+
+FIELDS = CLAIM_SCHEMA.names
+
+
+# ==============================
+# PATHS & COMPRESSION
+# ==============================
+#
+# Row formats (and raw .txt) may carry a compression suffix:
+#   x.jsonl.gz, x.jsonl.zst, x.jsonl.zip
+# Members of a zip archive are addressed as "archive.zip/member.jsonl".
+# Parquet and Arrow compress internally and are never wrapped.
+
+def split_compression(path):
+    base, ext = os.path.splitext(path)
+    if ext.lower() in COMPRESSIONS:
+        return base, ext.lower()
+    return path, ""
+
+
+def _zip_parts(path):
+    """
+    (archive, member) for a zip path, or (None, None).
+    """
+    marker = ZIP + "/"
+    i = path.lower().find(marker)
+    if i != -1:
+        return path[:i + len(ZIP)], path[i + len(marker):]
+
+    base, comp = split_compression(path)
+    if comp == ZIP:
+        return path, os.path.basename(base)
+
+    return None, None
+
+
+def corpus_name(path):
+    """
+    Plain file name of a corpus entry: no directory, archive or
+    compression suffix.
+    """
+    archive, member = _zip_parts(path)
+    if archive:
+        return os.path.basename(member)
+    return os.path.basename(split_compression(path)[0])
+
+
+def corpus_format(path):
+    ext = os.path.splitext(corpus_name(path))[1].lower()
+    if ext not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported corpus format: {path}")
+    return ext
+
+
+def list_corpus(directory, formats=SUPPORTED_FORMATS):
+    """
+    Corpus entries in directory, zip archives expanded into their members.
+    When the same file exists plain and compressed, the plain one is used.
+    """
+    entries = {}
+
+    for fname in sorted(os.listdir(directory), key=lambda f: (split_compression(f)[1] != "", f)):
+        base, comp = split_compression(fname)
+
+        if comp == ZIP:
+            with zipfile.ZipFile(os.path.join(directory, fname)) as zf:
+                candidates = [
+                    (os.path.basename(m), f"{fname}/{m}")
+                    for m in zf.namelist() if not m.endswith("/")
+                ]
+        else:
+            candidates = [(base, fname)]
+
+        for name, entry in candidates:
+            if os.path.splitext(name)[1].lower() not in formats:
+                continue
+            entries.setdefault(name, entry)
+
+    return [entries[name] for name in sorted(entries)]
+
+
+@contextmanager
+def open_text(path, mode="r", newline=None):
+    """
+    Text stream over a plain, gzip, zstd or zip-member file,
+    de/compressed on the fly. Zip archives written to directly hold one
+    member; "archive.zip/member" appends a new member.
+    """
+    if mode not in ("r", "w"):
+        raise ValueError(f"Unsupported mode: {mode}")
+
+    errors = "ignore" if mode == "r" else "strict"
+    archive, member = _zip_parts(path)
+
+    if archive:
+        single = not path.lower().endswith(ZIP + "/" + member.lower())
+        zip_mode = "r" if mode == "r" else ("w" if single else "a")
+
+        with zipfile.ZipFile(archive, zip_mode, compression=zipfile.ZIP_DEFLATED) as zf:
+            names = zf.namelist()
+
+            if mode == "r" and member not in names and len(names) == 1:
+                member = names[0]
+            if mode == "w" and member in names:
+                raise ValueError(f"{member} already exists in {archive}")
+
+            raw = zf.open(member, mode, force_zip64=True) if mode == "w" else zf.open(member)
+            f = io.TextIOWrapper(raw, encoding="utf-8", errors=errors, newline=newline)
+            try:
+                yield f
+            finally:
+                f.close()
+        return
+
+    comp = split_compression(path)[1]
+
+    if comp == GZIP:
+        f = gzip.open(path, mode + "t", encoding="utf-8", errors=errors, newline=newline)
+    elif comp == ZSTD:
+        f = zstandard.open(path, mode, encoding="utf-8", errors=errors, newline=newline)
+    else:
+        f = open(path, mode, encoding="utf-8", errors=errors, newline=newline)
+
+    try:
+        yield f
+    finally:
+        f.close()
+
+
+def _check_columnar(path):
+    if _zip_parts(path)[0] or split_compression(path)[1]:
+        raise ValueError(f"Parquet/Arrow files compress internally: {path}")
+
+
+# ==============================
+# HELPERS
+# ==============================
+
+def _drop_nulls(row):
+    return {k: v for k, v in row.items() if v is not None}
+
+
+def _from_csv(row):
+    out = {}
+    for k, v in row.items():
+        if v == "" or v is None:
+            continue
+        if k in CLAIM_SCHEMA.names:
+            t = CLAIM_SCHEMA.field(k).type
+            if pa.types.is_boolean(t):
+                v = v == "True"
+            elif pa.types.is_integer(t):
+                v = int(v)
+            elif pa.types.is_floating(t):
+                v = float(v)
+        out[k] = v
+    return out
+
+
+def _batches(records, size):
+    batch = []
+    for r in records:
+        batch.append(r)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _check_fields(row, fields):
+    # a field the format cannot hold is an error, not a silent drop
+    unknown = row.keys() - set(fields)
+    if unknown:
+        raise ValueError(f"Fields not in the schema: {sorted(unknown)}")
+
+
+def _to_batch(rows):
+    for r in rows:
+        _check_fields(r, FIELDS)
+    return pa.RecordBatch.from_pylist(rows, schema=CLAIM_SCHEMA)
+
+
+# ==============================
+# READ
+# ==============================
+
+def read_records(path):
+    """
+    Stream claim records (dicts) from any supported corpus file.
+    Empty columns are dropped, so rows look the same as JSONL rows.
+    """
+    fmt = corpus_format(path)
+
+    if fmt == JSONL:
+        with open_text(path) as f:
+            for line in f:
+                yield json.loads(line)
+
+    elif fmt == CSV:
+        with open_text(path, newline="") as f:
+            for row in csv.DictReader(f):
+                yield _from_csv(row)
+
+    elif fmt == PARQUET:
+        _check_columnar(path)
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_SIZE):
+            for row in batch.to_pylist():
+                yield _drop_nulls(row)
+
+    elif fmt == ARROW:
+        _check_columnar(path)
+        with pa.memory_map(path) as source:
+            reader = ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                for row in reader.get_batch(i).to_pylist():
+                    yield _drop_nulls(row)
+
+
+# ==============================
+# WRITE
+# ==============================
+
+def write_records(path, records, fields=None):
+    """
+    Stream records into path; format and compression come from the
+    extension.
+    Columnar formats are written in BATCH_SIZE row groups with the fixed
+    CLAIM_SCHEMA; CSV columns are fields (default: the schema's). A
+    record with a field outside them raises ValueError.
+    Returns the number of records written.
+    """
+    fmt = corpus_format(path)
+    n = 0
+
+    if fmt == JSONL:
+        with open_text(path, "w") as f:
+            for r in records:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+                n += 1
+
+    elif fmt == CSV:
+        with open_text(path, "w", newline="") as f:
+            fields = fields or FIELDS
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for r in records:
+                _check_fields(r, fields)
+                writer.writerow(r)
+                n += 1
+
+    elif fmt == PARQUET:
+        _check_columnar(path)
+        with pq.ParquetWriter(path, CLAIM_SCHEMA) as writer:
+            for rows in _batches(records, BATCH_SIZE):
+                writer.write_batch(_to_batch(rows))
+                n += len(rows)
+
+    elif fmt == ARROW:
+        _check_columnar(path)
+        with pa.OSFile(path, "wb") as sink:
+            with ipc.new_file(sink, CLAIM_SCHEMA) as writer:
+                for rows in _batches(records, BATCH_SIZE):
+                    writer.write_batch(_to_batch(rows))
+                    n += len(rows)
+
+    return n
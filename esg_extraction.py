@@ -0,0 +1,251 @@
+import re
+from pathlib import Path
+
+import pdfplumber
+from pdfminer.layout import LTChar, LTContainer
+
+# ===================== CONFIG =====================
+
+INCLUDE_KEYWORDS = [
+    "sustainability", "esg", "environment", "climate",
+    "value creation", "materiality", "stakeholder",
+    "strategy", "vision", "mission", "csr", "governance",
+    "biodiversity", "water", "emissions", "net zero"
+]
+
+STOP_KEYWORDS = [
+    "financial statements",
+    "balance sheet",
+    "profit and loss",
+    "cash flow",
+    "board of directors",
+    "notice of agm",
+    "statutory reports"
+]
+
+MIN_PAGE_TEXT_LENGTH = 300   # Ignore junk pages
+
+# Pages that open the financial-statements part of an integrated report.
+# With stop_at_financials, scanning ends after STOP_SECTION_RUN such pages
+# in a row, once past STOP_SECTION_MIN_FRACTION of the document (so the
+# table of contents does not trigger it).
+FINANCIAL_SECTION_MARKERS = [
+    "independent auditor",
+    "consolidated balance sheet",
+    "consolidated statement of profit and loss",
+    "standalone balance sheet",
+    "notes to the financial statements",
+    "notes to the consolidated financial statements",
+    "notes forming part of the financial statements",
+]
+STOP_SECTION_RUN = 2
+STOP_SECTION_MIN_FRACTION = 0.3
+
+# The triage text has no reliable spacing, so it is matched with all
+# whitespace removed. A page with fewer characters than this can never
+# reach MIN_PAGE_TEXT_LENGTH after extraction.
+TRIAGE_MIN_CHARS = MIN_PAGE_TEXT_LENGTH // 2
+
+# ===================== HELPERS =====================
+
+def clean_text(text: str) -> str:
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'page\s+\d+', '', text, flags=re.I)
+    return text.strip()
+
+def contains_any(text, keywords):
+    text = text.lower()
+    return any(k in text for k in keywords)
+
+def _squash(text):
+    return re.sub(r"\s+", "", text.lower())
+
+_INCLUDE_SQUASHED = [_squash(k) for k in INCLUDE_KEYWORDS]
+_FINANCIAL_SQUASHED = [_squash(k) for k in FINANCIAL_SECTION_MARKERS]
+
+# ===================== TRIAGE =====================
+#
+# Most of a page's cost is pdfplumber turning pdfminer's layout into
+# char dicts (page.chars) and then into words/lines (extract_text).
+# The layout itself is cached on the page, so reading its characters
+# first is almost free and lets irrelevant pages skip everything else.
+
+def sample_page_text(page):
+    """
+    Characters of a pdfplumber page in content-stream order, straight
+    from the pdfminer layout (no spacing, no char dicts).
+    """
+    parts = []
+    stack = [page.layout]
+
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, LTChar):
+            parts.append(obj.get_text())
+        elif isinstance(obj, LTContainer):
+            stack.extend(reversed(list(obj)))
+
+    return "".join(parts)
+
+
+def triage_page(sample):
+    """
+    False when the page can be skipped without full extraction:
+    too little text, or none of the INCLUDE_KEYWORDS.
+    """
+    squashed = _squash(sample)
+    if len(squashed) < TRIAGE_MIN_CHARS:
+        return False
+    return any(k in squashed for k in _INCLUDE_SQUASHED)
+
+
+def is_financial_section(sample):
+    squashed = _squash(sample)
+    return any(k in squashed for k in _FINANCIAL_SQUASHED)
+
+# ===================== MAIN FUNCTION =====================
+
+def scan_pdf(pdf_path, triage=True, stop_at_financials=False):
+    """
+    Relevant pages of a PDF as ["--- PAGE n ---" blocks], plus stats.
+    Triage skips extract_text on pages whose content-stream characters
+    contain no INCLUDE_KEYWORDS. It matches on that sample, not on the
+    extract_text output the page would be kept on, so a page can in
+    principle differ; bench_page_triage.py reports any it misses.
+    """
+    collected_text = []
+    stats = {
+        "pages": 0, "scanned": 0, "triaged_out": 0,
+        "extracted": 0, "kept": 0, "stopped_at": None
+    }
+    financial_run = 0
+
+    with pdfplumber.open(pdf_path) as pdf:
+        n_pages = len(pdf.pages)
+        stats["pages"] = n_pages
+
+        for page_num, page in enumerate(pdf.pages):
+            stats["scanned"] += 1
+
+            if triage or stop_at_financials:
+                try:
+                    sample = sample_page_text(page)
+                except Exception:
+                    sample = None
+
+                if sample is not None and stop_at_financials:
+                    if is_financial_section(sample):
+                        financial_run += 1
+                    else:
+                        financial_run = 0
+
+                    if (financial_run >= STOP_SECTION_RUN
+                            and page_num >= STOP_SECTION_MIN_FRACTION * n_pages):
+                        stats["stopped_at"] = page_num + 1
+                        break
+
+                if triage and sample is not None and not triage_page(sample):
+                    stats["triaged_out"] += 1
+                    page.close()
+                    continue
+
+            try:
+                text = page.extract_text(x_tolerance=2, y_tolerance=2)
+            except Exception:
+                continue
+            finally:
+                page.close()
+
+            stats["extracted"] += 1
+
+            if not text:
+                continue
+
+            text = clean_text(text)
+
+            # Skip very small text pages
+            if len(text) < MIN_PAGE_TEXT_LENGTH:
+                continue
+
+            # Drop pages that contain STOP keywords
+            if contains_any(text, STOP_KEYWORDS):
+                continue
+
+            # Keep only relevant pages
+            if contains_any(text, INCLUDE_KEYWORDS):
+                collected_text.append(f"\n--- PAGE {page_num + 1} ---\n{text}")
+
+    stats["kept"] = len(collected_text)
+    return collected_text, stats
+
+
+def extract_relevant_sections_safe(pdf_path, output_path, triage=True, stop_at_financials=False):
+    pdf_path = Path(pdf_path)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    collected_text, stats = scan_pdf(pdf_path, triage, stop_at_financials)
+
+    final_text = "\n".join(collected_text)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(final_text)
+
+    print("✅ Extraction complete")
+    print(f"📄 Pages extracted: {len(collected_text)}")
+    print(f"⚡ Pages skipped by triage: {stats['triaged_out']}/{stats['pages']}")
+    if stats["stopped_at"]:
+        print(f"🛑 Financial statements start at page {stats['stopped_at']}, stopped")
+    print(f"🧠 Characters extracted: {len(final_text)}")
+
+    return final_text
+
+# ===================== BATCH =====================
+
+def batch_extract_esg_pdfs(
+    input_dir="./dataset/raw_pdf",
+    output_dir="./dataset/extracted_text",
+    triage=True,
+    stop_at_financials=False
+):
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    summary = []
+
+    pdf_files = list(input_dir.glob("*.pdf"))
+
+    print(f"📂 Found {len(pdf_files)} PDF files\n")
+
+    for pdf_file in pdf_files:
+        try:
+            output_file = output_dir / f"{pdf_file.stem}_esg.txt"
+
+            print(f"▶️ Processing: {pdf_file.name}")
+            text = extract_relevant_sections_safe(
+                pdf_file, output_file, triage, stop_at_financials
+            )
+
+            summary.append({
+                "file": pdf_file.name,
+                "pages": len(text) // 4000,   # rough estimate
+                "characters": len(text)
+            })
+
+        except Exception as e:
+            print(f"❌ Failed: {pdf_file.name}")
+            print(str(e))
+            summary.append({
+                "file": pdf_file.name,
+                "pages": 0,
+                "characters": 0,
+                "error": str(e)
+            })
+
+    print("\n✅ Batch extraction complete\n")
+
+    for s in summary:
+        print(s)
+
+    return summary
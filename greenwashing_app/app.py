@@ -5,9 +5,20 @@ import torch
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
+import sys
+import time
 
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 from inference_preprocessing import pdf_text_to_atomic_sentences
+from sentence_segmenter import HEURISTIC, SPACY
+from result_store import ResultStore
+from atomic_extractor import primary_role
+import claim_store
+import risk_cube
+import yoy_delta
+from claim_spans import extract_company_year
 
 # -------------------------------------------------
 # Page config
@@ -30,6 +41,23 @@ def load_model():
 
 tokenizer, model = load_model()
 
+
+def session_claim_store():
+    # one connection per session: `with conn:` transactions of concurrent
+    # sessions must not share a connection
+    if "claim_store" not in st.session_state:
+        st.session_state["claim_store"] = claim_store.connect()
+    return st.session_state["claim_store"]
+
+store = session_claim_store()
+
+
+def session_results():
+    # scored reports of this session, spilled to disk
+    if "results" not in st.session_state:
+        st.session_state["results"] = ResultStore()
+    return st.session_state["results"]
+
 # -------------------------------------------------
 # Risk threshold
 # -------------------------------------------------
@@ -73,6 +101,35 @@ def predict_claims(sentences):
     return pd.DataFrame(rows)
 
 
+def predict_claims_delta(name, sentences):
+    """
+    Score only claims that are new or reworded since the company's
+    previous scored report; unchanged claims keep last year's score.
+    Falls back to full scoring when there is no previous report.
+    """
+    company, year = extract_company_year(name)
+    prev_year, prev = yoy_delta.previous_report(store, company, year)
+
+    if not prev:
+        return predict_claims(sentences), None
+
+    rows, removed = yoy_delta.delta_score(
+        prev,
+        sentences,
+        lambda batch: predict_claims(batch)["probability"].tolist()
+    )
+
+    df = pd.DataFrame(rows, columns=[
+        "sentence", "status", "probability", "prev_probability", "prev_sentence"
+    ])
+    df["high_risk"] = df["probability"] >= HIGH_RISK_THRESHOLD
+
+    summary = yoy_delta.summarize(rows, removed, HIGH_RISK_THRESHOLD)
+    summary["prev_year"] = prev_year
+
+    return df, {"summary": summary, "diff": pd.DataFrame(rows + removed)}
+
+
 def company_name_from_file(file):
     return os.path.splitext(file.name)[0]
 
@@ -83,93 +140,266 @@ def company_name_from_file(file):
 st.title("🌱 Greenwashing Risk Assessment")
 st.caption("Portfolio-Level ESG Risk Analysis for Investors & Auditors")
 
-uploaded_files = st.file_uploader(
-    "Can Upload Multiple ESG / Sustainability Reports (PDF)",
-    type=["pdf"],
-    accept_multiple_files=True
+portfolio_tab, trends_tab, search_tab = st.tabs(
+    ["📊 Portfolio", "📈 Trends", "🔎 Claim Search"]
 )
 
-if uploaded_files:
-    portfolio = []
+with portfolio_tab:
+    uploaded_files = st.file_uploader(
+        "Can Upload Multiple ESG / Sustainability Reports (PDF)",
+        type=["pdf"],
+        accept_multiple_files=True
+    )
+
+    delta_mode = st.checkbox(
+        "Year-over-year delta mode (re-score only new or changed claims)",
+        value=True
+    )
 
-    with st.spinner("Analyzing reports..."):
-        for file in uploaded_files:
-            company = company_name_from_file(file)
+    backend = st.radio(
+        "Sentence splitting",
+        [HEURISTIC, SPACY],
+        format_func={HEURISTIC: "Line ends (fast)", SPACY: "spaCy sentencizer"}.get,
+        horizontal=True
+    )
 
-            raw_text = read_pdf(file)
-            sentences = pdf_text_to_atomic_sentences(raw_text)
-            df = predict_claims(sentences)
+    if uploaded_files:
+        results = session_results()
+        keys = []
 
-            total = len(df)
-            high_risk = df["high_risk"].sum()
-            risk = high_risk / total if total else 0
+        with st.spinner("Analyzing reports..."):
+            for file in uploaded_files:
+                key = ResultStore.report_key(file.name, file.size, delta_mode, backend)
+                keys.append(key)
+                if key in results:
+                    continue   # already scored in this session
 
-            portfolio.append({
-                "company": company,
-                "risk_exposure": risk,
-                "total_claims": total,
-                "high_risk_claims": high_risk,
-                "details": df[df["high_risk"]]
-            })
+                company = company_name_from_file(file)
+                sentences = pdf_text_to_atomic_sentences(read_pdf(file), backend)
 
-    portfolio_df = pd.DataFrame(portfolio).sort_values(
-        by="risk_exposure",
-        ascending=False
-    )
+                if delta_mode:
+                    df, yoy = predict_claims_delta(company, sentences)
+                else:
+                    df, yoy = predict_claims(sentences), None
+
+                # also updates the persistent risk cube (risk_cube.py)
+                df["category"] = df["sentence"].map(primary_role)
+                claim_store.add_scored_report(store, company, df)
+                results.add(key, company, df, yoy)
 
-    # -------------------------------------------------
-    # Portfolio Bar Chart
-    # -------------------------------------------------
-    st.subheader("📊 Company-wise Greenwashing Risk")
+                # only the aggregates of this report stay in memory
+                del sentences, df, yoy
 
-    fig, ax = plt.subplots(figsize=(10, 4))
-    ax.bar(
-        portfolio_df["company"],
-        portfolio_df["risk_exposure"] * 100
+        results.retain(set(keys))
+
+        portfolio_df = results.aggregates(keys).sort_values(
+            by="risk_exposure",
+            ascending=False
+        )
+
+        # -------------------------------------------------
+        # Portfolio Bar Chart
+        # -------------------------------------------------
+        st.subheader("📊 Company-wise Greenwashing Risk")
+
+        fig, ax = plt.subplots(figsize=(10, 4))
+        ax.bar(
+            portfolio_df["company"],
+            portfolio_df["risk_exposure"] * 100
+        )
+        ax.set_ylabel("Greenwashing Risk (%)")
+        ax.set_xlabel("Company")
+        ax.set_title("Greenwashing Risk Exposure by Company")
+        plt.xticks(rotation=45, ha="right")
+
+        st.pyplot(fig)
+
+        # -------------------------------------------------
+        # Company Ranking Table
+        # -------------------------------------------------
+        st.subheader("🏢 Company Risk Ranking")
+
+        ranking_df = portfolio_df[[
+            "company",
+            "risk_exposure",
+            "high_risk_claims",
+            "total_claims"
+        ]].copy()
+
+        ranking_df["risk_exposure"] = (
+            ranking_df["risk_exposure"] * 100
+        ).round(1)
+
+        ranking_df.rename(columns={
+            "risk_exposure": "Greenwashing Risk (%)",
+            "high_risk_claims": "High-Risk Claims",
+            "total_claims": "Total ESG Claims"
+        }, inplace=True)
+
+        st.dataframe(ranking_df, width="stretch")
+
+        # -------------------------------------------------
+        # High-Risk Evidence (Expandable)
+        # -------------------------------------------------
+        st.subheader("🔍 High-Risk Claims by Company")
+
+        for _, row in portfolio_df.iterrows():
+            with st.expander(f"{row['company']} – High-Risk Claims"):
+                if row["high_risk_claims"] == 0:
+                    st.write("No high-risk claims detected.")
+                elif st.checkbox("Show claims", key=f"claims_{row['key']}"):
+                    # read from the session's spill files only when asked
+                    st.dataframe(
+                        results.high_risk_claims(row["key"]),
+                        width="stretch"
+                    )
+
+        # -------------------------------------------------
+        # Year-over-Year Changes (delta mode)
+        # -------------------------------------------------
+        yoy_rows = portfolio_df[portfolio_df["yoy"].notna()]
+
+        if not yoy_rows.empty:
+            st.subheader("📈 Year-over-Year Claim Changes")
+
+            for _, row in yoy_rows.iterrows():
+                summary = row["yoy"]
+
+                with st.expander(f"{row['company']} – vs {summary['prev_year']}"):
+                    c1, c2, c3, c4 = st.columns(4)
+                    c1.metric("Unchanged", summary["unchanged"])
+                    c2.metric("Changed", summary["changed"])
+                    c3.metric("Added", summary["added"])
+                    c4.metric("Removed", summary["removed"])
+
+                    st.metric(
+                        "Greenwashing Risk (%)",
+                        round(summary["risk_exposure"] * 100, 1),
+                        delta=round((summary["risk_exposure"] - summary["prev_risk_exposure"]) * 100, 1),
+                        delta_color="inverse"
+                    )
+                    st.caption(
+                        f"{summary['scored']} claims scored, "
+                        f"{summary['unchanged']} scores reused"
+                    )
+
+                    if st.checkbox("Show changed claims", key=f"diff_{row['key']}"):
+                        diff = results.diff(row["key"])
+                        st.dataframe(
+                            diff[diff["status"] != "unchanged"][[
+                                "status", "prev_probability", "probability",
+                                "prev_sentence", "sentence"
+                            ]],
+                            width="stretch"
+                        )
+
+
+# -------------------------------------------------
+# Trends (risk cube: every report scored so far)
+# -------------------------------------------------
+with trends_tab:
+    st.subheader("📈 Risk Trends and Peers")
+
+    cube_companies = risk_cube.companies(store)
+
+    if not cube_companies:
+        st.info("Score reports in the Portfolio tab to build up trends.")
+    else:
+        c1, c2 = st.columns([3, 1])
+        selected = c1.multiselect(
+            "Companies", cube_companies, default=cube_companies[:5]
+        )
+        threshold = c2.slider(
+            "High-risk threshold", 0.0, 1.0, HIGH_RISK_THRESHOLD, 0.01
+        )
+
+        t0 = time.perf_counter()
+        trend = pd.DataFrame(risk_cube.exposure(
+            store, threshold, by=("company", "year"), company=selected or None
+        ))
+        by_category = pd.DataFrame(risk_cube.exposure(
+            store, threshold, by=("company", "category"), company=selected or None
+        ))
+        elapsed = (time.perf_counter() - t0) * 1000
+
+        if not trend.empty:
+            fig, ax = plt.subplots(figsize=(10, 4))
+            for name, g in trend[trend["year"] > 0].groupby("company"):
+                ax.plot(g["year"], g["risk_exposure"] * 100, marker="o", label=name)
+            ax.set_ylabel("Greenwashing Risk (%)")
+            ax.set_xlabel("Year")
+            ax.set_title(f"Risk exposure by year (threshold {threshold:.2f})")
+            ax.xaxis.get_major_locator().set_params(integer=True)
+            ax.legend(fontsize="small")
+            st.pyplot(fig)
+
+            # year 0: reports whose file name carries no year
+            year = st.selectbox(
+                "Peer year", sorted(trend["year"].unique(), reverse=True),
+                format_func=lambda y: str(y) if y else "Unknown"
+            )
+            peers = trend[trend["year"] == year]
+
+            pivot = by_category.pivot(
+                index="company", columns="category", values="high_risk_claims"
+            ).fillna(0)
+            pivot = pivot.div(
+                by_category.groupby("company")["total_claims"].sum(), axis=0
+            ) * 100
+
+            c1, c2 = st.columns(2)
+
+            fig, ax = plt.subplots(figsize=(6, 4))
+            peers = peers.sort_values("risk_exposure", ascending=False)
+            ax.bar(peers["company"], peers["risk_exposure"] * 100)
+            ax.set_ylabel("Greenwashing Risk (%)")
+            ax.set_title(f"Peers in {year or 'unknown year'}")
+            plt.xticks(rotation=45, ha="right")
+            c1.pyplot(fig)
+
+            fig, ax = plt.subplots(figsize=(6, 4))
+            pivot.plot.bar(stacked=True, ax=ax)
+            ax.set_ylabel("High-risk claims (% of all claims)")
+            ax.set_title("High-risk claims by category, all years")
+            ax.legend(fontsize="small")
+            plt.xticks(rotation=45, ha="right")
+            c2.pyplot(fig)
+
+        st.caption(f"Aggregates read in {elapsed:.1f} ms")
+
+
+# -------------------------------------------------
+# Claim Search (historical corpus + past app runs)
+# -------------------------------------------------
+with search_tab:
+    st.subheader("🔎 Search ESG Claims")
+
+    companies, years, categories = claim_store.facets(store)
+
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    keyword = c1.text_input("Keyword", placeholder="e.g. net zero")
+    company = c2.selectbox("Company", ["All"] + companies)
+    year = c3.selectbox("Year", ["All"] + years)
+    category = c4.selectbox("Category", ["All"] + categories)
+    high_risk_only = st.checkbox("Only high-risk (scored) claims")
+
+    t0 = time.perf_counter()
+    results = claim_store.search(
+        store,
+        keyword=keyword,
+        company=None if company == "All" else company,
+        year=None if year == "All" else year,
+        category=None if category == "All" else category,
+        high_risk_only=high_risk_only
     )
-    ax.set_ylabel("Greenwashing Risk (%)")
-    ax.set_xlabel("Company")
-    ax.set_title("Greenwashing Risk Exposure by Company")
-    plt.xticks(rotation=45, ha="right")
-
-    st.pyplot(fig)
-
-    # -------------------------------------------------
-    # Company Ranking Table
-    # -------------------------------------------------
-    st.subheader("🏢 Company Risk Ranking")
-
-    ranking_df = portfolio_df[[
-        "company",
-        "risk_exposure",
-        "high_risk_claims",
-        "total_claims"
-    ]].copy()
-
-    ranking_df["risk_exposure"] = (
-        ranking_df["risk_exposure"] * 100
-    ).round(1)
-
-    ranking_df.rename(columns={
-        "risk_exposure": "Greenwashing Risk (%)",
-        "high_risk_claims": "High-Risk Claims",
-        "total_claims": "Total ESG Claims"
-    }, inplace=True)
-
-    st.dataframe(ranking_df, width="stretch")
-
-    # -------------------------------------------------
-    # High-Risk Evidence (Expandable)
-    # -------------------------------------------------
-    st.subheader("🔍 High-Risk Claims by Company")
-
-    for _, row in portfolio_df.iterrows():
-        with st.expander(f"{row['company']} – High-Risk Claims"):
-            if row["details"].empty:
-                st.write("No high-risk claims detected.")
-            else:
-                st.dataframe(
-                    row["details"][["sentence", "probability"]],
-                    width="stretch"
-                )
+    elapsed = (time.perf_counter() - t0) * 1000
 
+    st.caption(f"{len(results)} claims in {elapsed:.1f} ms")
+
+    if results:
+        st.dataframe(
+            pd.DataFrame(results)[[
+                "company", "year", "category", "probability", "page", "sentence"
+            ]],
+            width="stretch"
+        )
@@ -25,3 +25,12 @@ def explode_sentence(sentence):
             results.append(c)
 
     return results
+
+def primary_role(sentence):
+    """
+    First role in ROLE_PATTERNS order the claim matches, else "other".
+    """
+    for role, pat in ROLE_PATTERNS.items():
+        if pat.search(sentence):
+            return role
+    return "other"
@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import time
+import resource
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+from result_store import ResultStore
+
+SIZES = [50, 200, 800]    # reports per session
+CLAIMS_PER_REPORT = 2_000
+HIGH_RISK_THRESHOLD = 0.65
+
+# Process memory after scoring a portfolio of synthetic reports, each
+# size in a fresh process:
+#   in-memory -> the old portfolio list (high-risk DataFrame per company)
+#   spilled   -> ResultStore (aggregates in memory, tables on disk)
+# plus the time to load one company's details back from disk.
+
+WORDS = "we aim to reduce scope emissions by percent across our operations net zero".split()
+
+
+def fake_report(rng, i):
+    n = CLAIMS_PER_REPORT
+    picks = rng.integers(0, len(WORDS), size=(n, 20))
+    sentences = [f"{' '.join(WORDS[w] for w in row)} {i}-{j}" for j, row in enumerate(picks)]
+    prob = rng.random(n).round(3)
+    return pd.DataFrame({
+        "sentence": sentences,
+        "probability": prob,
+        "high_risk": prob >= HIGH_RISK_THRESHOLD
+    })
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def child(mode, n):
+    rng = np.random.default_rng(0)
+    base = rss_mb()
+    load_ms = None
+
+    if mode == "memory":
+        portfolio = []
+        for i in range(n):
+            df = fake_report(rng, i)
+            portfolio.append({
+                "company": f"C{i}",
+                "risk_exposure": df["high_risk"].mean(),
+                "total_claims": len(df),
+                "high_risk_claims": df["high_risk"].sum(),
+                "details": df[df["high_risk"]],
+                "yoy": None
+            })
+            del df
+    else:
+        results = ResultStore()
+        for i in range(n):
+            df = fake_report(rng, i)
+            results.add(f"C{i}.pdf|0|1", f"C{i}", df)
+            del df
+
+        t0 = time.perf_counter()
+        results.high_risk_claims(next(iter(results.reports)))
+        load_ms = (time.perf_counter() - t0) * 1000
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"held": rss_mb() - base, "peak": peak, "load_ms": load_ms}))
+
+
+def main():
+    print(f"{'reports':>8}{'method':>11}{'held MB':>10}{'peak MB':>10}{'details ms':>12}")
+    for n in SIZES:
+        for mode in ("memory", "spilled"):
+            out = subprocess.run(
+                [sys.executable, __file__, mode, str(n)],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            r = json.loads(out)
+            load = f"{r['load_ms']:.1f}" if r["load_ms"] is not None else "-"
+            print(f"{n:>8}{mode:>11}{r['held']:>10.1f}{r['peak']:>10.1f}{load:>12}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        child(sys.argv[1], int(sys.argv[2]))
+    else:
+        main()
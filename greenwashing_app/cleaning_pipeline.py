@@ -11,26 +11,19 @@ METRIC_PATTERN = re.compile(
     re.I
 )
 
-def remove_inline_junk(text: str) -> str:
-    text = re.sub(r"\bPAGE\s*\d+\b", " ", text, flags=re.I)
-    text = re.sub(r"-{2,}", " ", text)
-    return text.strip()
-
-def normalize_text(text: str) -> str:
-    text = text.replace("CO₂", "CO2")
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
-
-def reconstruct_sentences(lines):
+def reconstruct_sentences(lines, breaks=()):
+    """
+    breaks: line indices after which a sentence always ends.
+    """
     sentences = []
     buffer = ""
 
-    for line in lines:
+    for i, line in enumerate(lines):
         if not buffer:
             buffer = line
             continue
 
-        if buffer.endswith((".", "!", "?")):
+        if buffer.endswith((".", "!", "?")) or i - 1 in breaks:
             sentences.append(buffer)
             buffer = line
         else:
@@ -1,24 +1,42 @@
 from cleaning_pipeline import (
-    remove_inline_junk,
-    normalize_text,
     reconstruct_sentences,
     is_environment_relevant,
     has_metric
 )
 
 from atomic_extractor import explode_sentence
+from junk_rules import clean_line
+from sentence_segmenter import HEURISTIC, SPACY, sentences as spacy_sentences
+from table_regions import strip_tables
 
-def pdf_text_to_atomic_sentences(raw_text: str):
+# HEURISTIC (line ends) or SPACY (sentencizer, sentence_segmenter.py)
+SENTENCE_BACKEND = HEURISTIC
+
+def pdf_text_to_atomic_sentences(raw_text: str, backend=SENTENCE_BACKEND):
     lines = raw_text.split("\n")
 
     cleaned_lines = []
+    breaks = set()
     for line in lines:
-        line = remove_inline_junk(line)
-        line = normalize_text(line)
-        if line:
-            cleaned_lines.append(line)
-
-    sentences = reconstruct_sentences(cleaned_lines)
+        line = clean_line(line)
+
+        # table rows / figure labels are cut out and end the sentence
+        # before them
+        pieces, regions = strip_tables(line)
+        k = 0
+        for start, end in pieces:
+            while k < len(regions) and regions[k][0] < start:
+                if cleaned_lines:
+                    breaks.add(len(cleaned_lines) - 1)
+                k += 1
+            cleaned_lines.append(line[start:end])
+        if k < len(regions) and cleaned_lines:
+            breaks.add(len(cleaned_lines) - 1)
+
+    if backend == SPACY:
+        sentences = spacy_sentences(cleaned_lines, breaks)
+    else:
+        sentences = reconstruct_sentences(cleaned_lines, breaks)
 
     atomic_sentences = []
 
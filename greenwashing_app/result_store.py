@@ -0,0 +1,92 @@
+import os
+import hashlib
+import tempfile
+
+import pandas as pd
+
+# ==============================
+# SESSION RESULT STORE
+# ==============================
+#
+# Scored claim tables go to Parquet files in a per-session temp directory
+# as soon as a report is done; memory only holds one aggregate row per
+# report. Tables are read back when the user asks for a company's details.
+# The directory is removed when the session (and this object) goes away.
+
+CLAIM_COLUMNS = ["sentence", "probability", "high_risk"]
+DIFF_COLUMNS = ["status", "prev_probability", "probability", "prev_sentence", "sentence"]
+
+
+class ResultStore:
+
+    def __init__(self, root=None):
+        self._tmp = tempfile.TemporaryDirectory(prefix="greenwashing_", dir=root)
+        self.dir = self._tmp.name
+        self.reports = {}   # key -> aggregates
+
+    @staticmethod
+    def report_key(name, size, delta_mode, backend="heuristic"):
+        return f"{name}|{size}|{int(delta_mode)}|{backend}"
+
+    def _path(self, key, kind):
+        digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.dir, f"{digest}.{kind}.parquet")
+
+    def __contains__(self, key):
+        return key in self.reports
+
+    def add(self, key, company, df, yoy=None):
+        """
+        Spill one scored report and keep its aggregates.
+        df: sentence, probability, high_risk; yoy: predict_claims_delta's.
+        """
+        df[CLAIM_COLUMNS].to_parquet(self._path(key, "claims"), index=False)
+
+        total = len(df)
+        high_risk = int(df["high_risk"].sum())
+
+        summary = None
+        if yoy is not None:
+            summary = yoy["summary"]
+            diff = yoy["diff"].reindex(columns=DIFF_COLUMNS)
+            diff.to_parquet(self._path(key, "diff"), index=False)
+
+        self.reports[key] = {
+            "key": key,
+            "company": company,
+            "risk_exposure": high_risk / total if total else 0,
+            "total_claims": total,
+            "high_risk_claims": high_risk,
+            "yoy": summary
+        }
+
+    def retain(self, keys):
+        """
+        Drop reports (and their files) that are not in keys.
+        """
+        for key in list(self.reports):
+            if key in keys:
+                continue
+            for kind in ("claims", "diff"):
+                path = self._path(key, kind)
+                if os.path.exists(path):
+                    os.remove(path)
+            del self.reports[key]
+
+    def aggregates(self, keys=None):
+        keys = self.reports if keys is None else keys
+        return pd.DataFrame(
+            [self.reports[k] for k in keys if k in self.reports],
+            columns=["key", "company", "risk_exposure", "total_claims",
+                     "high_risk_claims", "yoy"]
+        )
+
+    def high_risk_claims(self, key):
+        return pd.read_parquet(
+            self._path(key, "claims"),
+            columns=["sentence", "probability"],
+            filters=[("high_risk", "==", True)]
+        )
+
+    def diff(self, key):
+        return pd.read_parquet(self._path(key, "diff"))
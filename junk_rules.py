@@ -0,0 +1,69 @@
+import re
+
+# ==============================
+# RULES
+# ==============================
+#
+# One rule set for the offline pipeline (cleaning_pipeline.py) and the
+# app (greenwashing_app/inference_preprocessing.py), compiled once here.
+# Per line: one header match; a substring check for the literal each
+# group of junk rules needs ("page" / "--"); that group's patterns only
+# when it is there (under 10% of raw_txt lines); one split/join for
+# whitespace. The patterns run one after another, in list order, as the
+# earlier per-rule re.sub chain did: a single alternation would give
+# different output (e.g. "Report 12 PAGE 3 text").
+
+# ---------- HEADER LINES (dropped whole) ----------
+SECTION_HEADERS = [
+    r"^[A-Z\s&/]{6,}$",     # ALL CAPS headers
+    r"^CONTENTS?$",
+    r"^INTRODUCTION$",
+    r"^GOVERNANCE$",
+    r"^PERFORMANCE$",
+]
+
+# ---------- INLINE JUNK (replaced by a space) ----------
+PAGE_PATTERNS = [
+    r"(?i:---\s*PAGE\s*\d+\s*---)",      # page markers
+    r"(?i:\bPAGE\s*\d+\b)",              # "Page 12"
+    r"\b\d+\s*(?=PAGE)",                  # page number before PAGE
+]
+
+SEPARATORS = [
+    r"-{2,}",                            # leftover dashed separators
+]
+
+_HEADER = re.compile("|".join(f"(?:{p})" for p in SECTION_HEADERS))
+_PAGE = [re.compile(p) for p in PAGE_PATTERNS]
+_SEPARATORS = [re.compile(p) for p in SEPARATORS]
+
+
+# ==============================
+# API
+# ==============================
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.replace("CO₂", "CO2").split())
+
+
+def strip_junk(text: str) -> str:
+    """
+    Inline junk removed and whitespace normalized.
+    """
+    if "page" in text.lower():
+        for pat in _PAGE:
+            text = pat.sub(" ", text)
+    if "--" in text:
+        for pat in _SEPARATORS:
+            text = pat.sub(" ", text)
+    return normalize_text(text)
+
+
+def clean_line(line: str) -> str:
+    """
+    Cleaned line, or "" when the whole line is junk.
+    """
+    line = line.strip()
+    if not line or _HEADER.match(line):
+        return ""
+    return strip_junk(line)
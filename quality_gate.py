@@ -0,0 +1,329 @@
+import os
+import sys
+import json
+from bisect import bisect_right, insort
+from collections import Counter
+from contextlib import ExitStack
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "Refinement"))
+
+from patterns import GLOSSARY_REGEX
+from claim_roles import ROLE_BITS
+from claim_spans import resolve
+from corpus_io import open_text
+
+# ==============================
+# CONFIG
+# ==============================
+#
+# Inline quality gate for records streaming out of a pipeline stage
+# (Refinement/refine_pipeline.py, atomic_pipeline/atomic_extractor.py).
+# Every record is checked against the stage's rule set once, on its way
+# to write_records:
+#   quarantine -> the record goes to the stage's quarantine file instead
+#                 of the output, with the rules it failed
+#   flag       -> the record is counted, and still written
+# Memory does not grow with the corpus: lengths are summarized by a
+# running mean/variance and P² quantile estimators, and duplicates are
+# looked up in the claims of the current report only (records stream
+# report by report), which is exact.
+
+QUARANTINE = "quarantine"
+FLAG = "flag"
+
+MIN_CLAIM_LEN = 30
+MAX_CLAIM_LEN = 400
+
+# metric claims must not carry governance language
+GOVERNANCE_WORDS = ["board", "committee", "oversight", "governance"]
+
+MAX_DUPLICATE_RATE = 0.05
+
+LENGTH_QUANTILES = (0.5, 0.9, 0.99)
+
+
+# ==============================
+# STREAMING STATISTICS
+# ==============================
+
+class P2Quantile:
+    """
+    P² estimate of one quantile (Jain & Chlamtac, 1985): five markers,
+    adjusted as values arrive.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.q = []
+        self.n = [0, 1, 2, 3, 4]
+        self.np = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.dn = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        q, n = self.q, self.n
+
+        if len(q) < 5:
+            insort(q, x)
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect_right(q, x) - 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.np[i] += self.dn[i]
+
+        for i in (1, 2, 3):
+            d = self.np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                h = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < h < q[i + 1]:
+                    h = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = h
+                n[i] += d
+
+    def value(self):
+        if not self.q:
+            return None
+        if len(self.q) < 5:
+            return self.q[round(self.p * (len(self.q) - 1))]
+        return self.q[2]
+
+
+class StreamingStats:
+    """
+    Count, mean, standard deviation, min/max (Welford) and quantile
+    estimates of a stream of numbers.
+    """
+
+    def __init__(self, quantiles=LENGTH_QUANTILES):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+        for est in self.quantiles.values():
+            est.add(x)
+
+    @property
+    def std(self):
+        return (self._m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+            **{f"p{round(p * 100)}": est.value() for p, est in self.quantiles.items()}
+        }
+
+
+# ==============================
+# RULES
+# ==============================
+#
+# rule(gate, row, text, start, end) -> True when the record fails.
+# New rules are added with @rule("name") and enabled per stage in its
+# QUALITY_RULES.
+
+RULES = {}
+
+
+def rule(name):
+    def register(fn):
+        RULES[name] = fn
+        return fn
+    return register
+
+
+@rule("length")
+def out_of_bounds(gate, row, text, start, end):
+    return not MIN_CLAIM_LEN <= end - start <= MAX_CLAIM_LEN
+
+
+@rule("glossary")
+def glossary_leak(gate, row, text, start, end):
+    return bool(GLOSSARY_REGEX.search(text, start, end))
+
+
+@rule("mixed_role")
+def mixed_role(gate, row, text, start, end):
+    if "roles" in row:
+        metric = int(row["roles"]) & ROLE_BITS["metric"]
+    else:
+        metric = row.get("has_metric")
+    if not metric:
+        return False
+    s = text[start:end].lower()
+    return any(w in s for w in GOVERNANCE_WORDS)
+
+
+@rule("duplicate")
+def duplicate(gate, row, text, start, end):
+    # repeats within one report; the same boilerplate in two reports is kept
+    doc = row.get("doc_id") or (row.get("company"), row.get("year"))
+    return gate.seen(doc, text[start:end].lower())
+
+
+# ==============================
+# GATE
+# ==============================
+
+class QualityGate:
+    """
+    gate.check(records) passes records through, quarantining or flagging
+    the ones that fail the enabled rules.
+
+    rules: {rule name: QUARANTINE | FLAG}, evaluated in order.
+    quarantine_path: JSONL file for quarantined records; without one,
+    every rule only flags.
+    """
+
+    def __init__(self, rules, quarantine_path=None):
+        unknown = set(rules) - set(RULES)
+        if unknown:
+            raise ValueError(f"Unknown quality rules: {sorted(unknown)}")
+
+        self.rules = [(name, RULES[name], action) for name, action in rules.items()]
+        self.quarantine_path = quarantine_path
+        if quarantine_path and os.path.exists(quarantine_path):
+            os.remove(quarantine_path)     # left from an earlier run
+
+        self.total = 0
+        self.quarantined = 0
+        self.multi_role = 0
+        self.violations = Counter()
+        self.lengths = StreamingStats()
+
+        self._doc = None
+        self._doc_claims = set()
+        self._files = ExitStack()
+        self._quarantine = None
+
+    def seen(self, doc, claim):
+        """
+        True when claim was already seen in doc. Only the current
+        document's claims are kept; a new doc starts a new set.
+        """
+        if doc != self._doc:
+            self._doc = doc
+            self._doc_claims = set()
+        if claim in self._doc_claims:
+            return True
+        self._doc_claims.add(claim)
+        return False
+
+    def evaluate(self, row):
+        """
+        (failed rule names, quarantine?) for one record; updates the stats.
+        """
+        text, start, end = resolve(row)
+
+        self.total += 1
+        self.lengths.add(end - start)
+
+        mask = int(row.get("roles", 0))
+        if mask & (mask - 1):
+            self.multi_role += 1
+
+        failed = []
+        drop = False
+        for name, check, action in self.rules:
+            if check(self, row, text, start, end):
+                failed.append(name)
+                self.violations[name] += 1
+                drop = drop or action == QUARANTINE
+
+        return failed, drop and self.quarantine_path is not None
+
+    def check(self, records):
+        for row in records:
+            failed, drop = self.evaluate(row)
+            if drop:
+                self._quarantine_row(row, failed)
+            else:
+                yield row
+
+    def _quarantine_row(self, row, failed):
+        if self._quarantine is None:
+            os.makedirs(os.path.dirname(self.quarantine_path) or ".", exist_ok=True)
+            self._quarantine = self._files.enter_context(
+                open_text(self.quarantine_path, "w")
+            )
+        record = dict(row, violations=failed)
+        self._quarantine.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.quarantined += 1
+
+    def close(self):
+        self._files.close()
+        self._quarantine = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def passed(self):
+        return self.total - self.quarantined
+
+    @property
+    def duplicate_rate(self):
+        return self.violations["duplicate"] / self.total if self.total else 0.0
+
+    def report(self):
+        return {
+            "total": self.total,
+            "passed": self.passed,
+            "quarantined": self.quarantined,
+            "multi_role": self.multi_role,
+            "violations": dict(self.violations),
+            "duplicate_rate": self.duplicate_rate,
+            "length": self.lengths.summary()
+        }
+
+    def summary(self):
+        lines = [
+            f"Records: {self.total} ({self.passed} passed, {self.quarantined} quarantined)"
+        ]
+        if self.total:
+            s = self.lengths.summary()
+            quantiles = ", ".join(
+                f"p{round(p * 100)} {est.value():.0f}"
+                for p, est in self.lengths.quantiles.items()
+            )
+            lines.append(
+                f"Length: mean {s['mean']:.0f} ± {s['std']:.0f}, "
+                f"min {s['min']}, max {s['max']}, {quantiles}"
+            )
+        for name, _, action in self.rules:
+            lines.append(f"  {name} [{action}]: {self.violations[name]}")
+        if "duplicate" in self.violations and self.duplicate_rate > MAX_DUPLICATE_RATE:
+            lines.append(
+                f"⚠️ Duplicate rate {self.duplicate_rate:.1%} above {MAX_DUPLICATE_RATE:.0%}"
+            )
+        return "\n".join(lines)
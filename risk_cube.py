@@ -0,0 +1,173 @@
+import math
+
+import numpy as np
+
+# ==============================
+# CONFIG
+# ==============================
+#
+# Persistent company x year x category risk aggregates, kept in the
+# claim store (claims.db) next to the claims they summarize.
+# A cell holds the histogram of model probabilities of its scored
+# claims rather than a high-risk count, so exposure at any threshold
+# is a sum over bins. Whenever scores for a company-year are written
+# (claim_store.add_claims), only that company-year's cells are
+# recomputed from its own claims; reads never touch the claims table.
+
+# Thresholds resolve to 1/BINS: exposure at a threshold on that grid
+# (the app's slider steps) equals counting claims with p >= threshold.
+BINS = 100
+
+UNCATEGORIZED = "uncategorized"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS risk_cube (
+    company    TEXT NOT NULL,
+    year       INTEGER NOT NULL,
+    category   TEXT NOT NULL,
+    claims     INTEGER NOT NULL,
+    histogram  BLOB NOT NULL,      -- BINS + 1 int32 counts
+    PRIMARY KEY (company, year, category)
+) WITHOUT ROWID;
+"""
+
+_DTYPE = np.dtype("<i4")
+
+
+# ==============================
+# MAINTENANCE
+# ==============================
+
+def install(conn):
+    """
+    Create the cube; fill it from the claims already scored when it is
+    new.
+    """
+    fresh = not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'risk_cube'"
+    ).fetchone()
+    conn.executescript(SCHEMA)
+    if fresh:
+        rebuild(conn)
+
+
+def bin_of(probability):
+    return min(int(probability * BINS + 1e-6), BINS)
+
+
+def refresh(conn, company, year):
+    """
+    Recompute the cells of one company-year from its scored claims.
+    Runs inside the caller's transaction, if any.
+    """
+    hists = {}
+    for category, p in conn.execute(
+        "SELECT category, probability FROM claims"
+        " WHERE company IS ? AND year IS ? AND probability IS NOT NULL",
+        (company, year)
+    ):
+        category = category or UNCATEGORIZED
+        if category not in hists:
+            hists[category] = np.zeros(BINS + 1, dtype=_DTYPE)
+        hists[category][bin_of(p)] += 1
+
+    key = (company or "", year or 0)
+    conn.execute("DELETE FROM risk_cube WHERE company = ? AND year = ?", key)
+    conn.executemany(
+        "INSERT INTO risk_cube VALUES (?, ?, ?, ?, ?)",
+        [key + (c, int(h.sum()), h.tobytes()) for c, h in hists.items()]
+    )
+
+
+def rebuild(conn):
+    with conn:
+        conn.execute("DELETE FROM risk_cube")
+        for company, year in conn.execute(
+            "SELECT DISTINCT company, year FROM claims WHERE probability IS NOT NULL"
+        ).fetchall():
+            refresh(conn, company, year)
+
+
+# ==============================
+# QUERY
+# ==============================
+
+def threshold_bin(threshold):
+    # first bin whose probabilities are all >= threshold
+    return math.ceil(threshold * BINS - 1e-6)
+
+
+def _where(company=None, year=None, category=None):
+    where, params = [], []
+    for col, value in (("company", company), ("year", year), ("category", category)):
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            where.append(f"{col} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            where.append(f"{col} = ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(where) if where else ""), params
+
+
+def _cells(conn, company=None, year=None, category=None):
+    """
+    (keys, histograms): (company, year, category) per cell and a
+    cells x (BINS + 1) count matrix.
+    """
+    where, params = _where(company, year, category)
+    rows = conn.execute(
+        f"SELECT company, year, category, histogram FROM risk_cube{where}"
+        " ORDER BY company, year, category",
+        params
+    ).fetchall()
+
+    keys = [(r[0], r[1], r[2]) for r in rows]
+    hists = np.frombuffer(b"".join(r[3] for r in rows), dtype=_DTYPE)
+    return keys, hists.reshape(len(rows), BINS + 1)
+
+
+def exposure(conn, threshold, by=("company", "year"),
+             company=None, year=None, category=None):
+    """
+    Risk exposure at threshold, grouped by any of company / year /
+    category. Rows: the group columns, total_claims, high_risk_claims,
+    risk_exposure.
+    """
+    keys, hists = _cells(conn, company, year, category)
+    totals = hists.sum(axis=1)
+    high = hists[:, threshold_bin(threshold):].sum(axis=1)
+
+    cols = [("company", "year", "category").index(c) for c in by]
+    groups = {}
+    for key, n, h in zip(keys, totals.tolist(), high.tolist()):
+        g = tuple(key[i] for i in cols)
+        acc = groups.setdefault(g, [0, 0])
+        acc[0] += n
+        acc[1] += h
+
+    rows = []
+    for g in sorted(groups):
+        n, h = groups[g]
+        if not n:
+            continue
+        row = dict(zip(by, g))
+        row.update(total_claims=n, high_risk_claims=h, risk_exposure=h / n)
+        rows.append(row)
+    return rows
+
+
+def histogram(conn, company=None, year=None, category=None):
+    """
+    Scored claims per probability bin (BINS + 1 counts, bin i covering
+    [i / BINS, (i + 1) / BINS)).
+    """
+    _, hists = _cells(conn, company, year, category)
+    return hists.sum(axis=0).tolist()
+
+
+def companies(conn):
+    return [r[0] for r in conn.execute(
+        "SELECT DISTINCT company FROM risk_cube WHERE company != '' ORDER BY company"
+    )]
@@ -0,0 +1,116 @@
+from collections import deque
+from functools import lru_cache
+
+import spacy
+from spacy.symbols import ORTH
+
+from claim_spans import strip_span
+
+# ==============================
+# CONFIG
+# ==============================
+#
+# spaCy sentence boundaries for the cleaning pipelines, as an
+# alternative to the line-end heuristic in reconstruct_sentence_spans:
+#   - boundaries inside lines ("... in 2020. Our target ...") are found
+#   - abbreviations ("U.S.", "approx.") do not end a sentence
+# A blank English pipeline with the rule-based sentencizer only; no
+# model download. Each document is cut into blocks at its forced breaks
+# (table regions), and the blocks of all documents go through one
+# nlp.pipe stream, in batches.
+
+HEURISTIC = "heuristic"
+SPACY = "spacy"
+BACKENDS = (HEURISTIC, SPACY)
+
+LANGUAGE = "en"
+BATCH_SIZE = 256          # blocks per nlp.pipe batch
+# Worker processes tokenize and split the block texts; results come back
+# as serialized Docs. Not yet measured to scale (bench_sentence_segmenter.py
+# on a multi-core machine), so one process by default.
+N_PROCESS = 1
+MAX_LENGTH = 2_000_000    # characters per block
+
+# Kept as one token so the sentencizer does not end a sentence on them;
+# spaCy's English exceptions already cover "U.S.", "Inc.", "e.g." etc.
+ABBREVIATIONS = [
+    "No.", "Nos.", "no.", "Fig.", "approx.", "ft.", "sq.",
+    "Rs.", "Pvt.", "Mn.", "Bn.", "Cr.",
+]
+
+
+@lru_cache(maxsize=1)
+def load_sentencizer():
+    nlp = spacy.blank(LANGUAGE)
+    nlp.add_pipe("sentencizer")
+    for abbr in ABBREVIATIONS:
+        nlp.tokenizer.add_special_case(abbr, [{ORTH: abbr}])
+    nlp.max_length = MAX_LENGTH
+    return nlp
+
+
+def _blocks(lines, breaks):
+    """
+    (start, end) of the runs of lines between forced breaks, as offsets
+    into " ".join(lines).
+    """
+    blocks = []
+    start = pos = 0
+
+    for i, line in enumerate(lines):
+        end = pos + len(line)
+        if i in breaks or i == len(lines) - 1:
+            blocks.append((start, end))
+            start = end + 1
+        pos = end + 1
+
+    return blocks
+
+
+def iter_sentence_spans(items, n_process=N_PROCESS, batch_size=BATCH_SIZE):
+    """
+    Sentence spans of many documents in one nlp.pipe stream.
+
+    items: ((lines, breaks), context) pairs
+    Yields (spans, context) in input order; spans are (start, end)
+    offsets into " ".join(lines), like reconstruct_sentence_spans.
+    Only block texts go to nlp.pipe (and to its workers); contexts stay
+    in this process, queued until their last block comes back.
+    """
+    nlp = load_sentencizer()
+    pending = deque()     # (offset, last, context) per block sent
+
+    def blocks():
+        for (lines, breaks), context in items:
+            text = " ".join(lines)
+            bounds = _blocks(lines, breaks) or [(0, 0)]
+            for i, (start, end) in enumerate(bounds):
+                pending.append((start, i == len(bounds) - 1, context))
+                yield text[start:end]
+
+    spans = []
+    for doc in nlp.pipe(blocks(), batch_size=batch_size, n_process=n_process):
+        offset, last, context = pending.popleft()
+        for sent in doc.sents:
+            s, e = strip_span(doc.text, sent.start_char, sent.end_char)
+            if s < e:
+                spans.append((offset + s, offset + e))
+        if last:
+            yield spans, context
+            spans = []
+
+
+def sentence_spans(lines, breaks=()):
+    """
+    Spans of a single document, in this process.
+    """
+    for spans, _ in iter_sentence_spans([((lines, breaks), None)], n_process=1):
+        return spans
+
+
+def sentences(lines, breaks=()):
+    """
+    Sentence strings of a single document.
+    """
+    text = " ".join(lines)
+    return [text[s:e] for s, e in sentence_spans(lines, breaks)]
@@ -0,0 +1,161 @@
+import re
+
+from claim_spans import strip_span
+
+# ==============================
+# CONFIG
+# ==============================
+#
+# Flattened tables and figure labels end up inside text lines, e.g.
+#   "... GOAL 2005 2010 2012 2014 Baseline Wood fiber sourced by ..."
+#   "2.0 1.8 1.6 1.4 1.2 1.0 0.8 0.6 0.4 0.2 0.0 1975 1985 ..."
+#   "... in 2014 2015 LEADERSHIP IN SUSTAINABILITY AWARD FOR ENERGY ..."
+# Two kinds of region are cut out of a line:
+#   numbers  -> MIN_NUMBERS+ numbers, at most MAX_NUMBER_GAP non-prose
+#               tokens between neighbours (prose such as "and"/"to"
+#               ends the run, so "from 2005 to 2020" stays)
+#   headings -> MIN_CAPS_WORDS+ ALL-CAPS words in a row with at least
+#               MIN_CAPS_LETTERS letters between them (acronym pairs
+#               like "U.S. EPA" and lists like "API, TXOGA" stay), at
+#               the start or end of the line or next to a number run;
+#               never between prose words, so "the UNITED NATIONS
+#               GLOBAL COMPACT in 2015" stays
+# Detection is one pass over the whitespace tokens of a line, so the
+# cost per page is linear in its text.
+
+MIN_NUMBERS = 4
+MAX_NUMBER_GAP = 1
+MIN_CAPS_WORDS = 2
+MIN_CAPS_LETTERS = 8
+
+TOKEN = re.compile(r"\S+")
+NUMBER = re.compile(r"[(\-–+]?[$€£₹]?\d[\d,.]*[%x]?\)?[,;:]?")
+CAPS = re.compile(r"[A-Z][A-Z0-9&/'’.\-]*:?")
+SEPARATOR = re.compile(r"[/&|•·–—\-+]")
+PROSE = re.compile(r"[a-z][a-z’'\-]*[,;:.]?")
+
+NUM, CAPS_WORD, SEP, PROSE_WORD, WORD = range(5)
+
+
+# ==============================
+# DETECTION
+# ==============================
+
+def _kind(token):
+    if NUMBER.fullmatch(token):
+        return NUM
+    if SEPARATOR.fullmatch(token):
+        return SEP
+    if CAPS.fullmatch(token) and sum(c.isalpha() for c in token) >= 2:
+        return CAPS_WORD
+    if PROSE.fullmatch(token):
+        return PROSE_WORD
+    return WORD
+
+
+def _number_runs(kinds):
+    runs = []
+    first = last = None
+    count = 0
+
+    for i, k in enumerate(kinds):
+        if k == NUM:
+            if first is not None and i - last - 1 <= MAX_NUMBER_GAP:
+                count += 1
+            else:
+                if count >= MIN_NUMBERS:
+                    runs.append((first, last))
+                first, count = i, 1
+            last = i
+
+        elif k == PROSE_WORD and first is not None:
+            if count >= MIN_NUMBERS:
+                runs.append((first, last))
+            first, count = None, 0
+
+    if count >= MIN_NUMBERS:
+        runs.append((first, last))
+    return runs
+
+
+def _is_heading(kinds, begin, stop, numbers):
+    """
+    Whether the caps run spanning tokens begin..stop-1 is a heading:
+    it starts or ends the line, or borders a number run, and does not
+    sit between prose words ("We reduced CO2 EMISSIONS by 20%").
+    """
+    before = kinds[begin - 1] if begin > 0 else None
+    after = kinds[stop] if stop < len(kinds) else None
+    if before == PROSE_WORD and after == PROSE_WORD:
+        return False
+    if before is None or after is None:
+        return True
+    return any(a <= stop and b >= begin - 1 for a, b in numbers)
+
+
+def _heading_runs(tokens, kinds, numbers):
+    runs = []
+    caps = []   # CAPS_WORD indices of the current run
+    begin = 0   # first token of the run, numbers/separators included
+
+    for i, k in enumerate(kinds + [WORD]):
+        if k == CAPS_WORD:
+            caps.append(i)
+        elif k in (NUM, SEP):
+            continue
+        else:
+            if len(caps) >= MIN_CAPS_WORDS:
+                letters = sum(
+                    c.isalpha()
+                    for j in caps
+                    for c in tokens[j].group()
+                )
+                if letters >= MIN_CAPS_LETTERS and _is_heading(kinds, begin, i, numbers):
+                    runs.append((caps[0], caps[-1]))
+            caps = []
+            begin = i + 1
+
+    return runs
+
+
+def find_table_regions(line):
+    """
+    (start, end) character ranges of table/figure text in line.
+    """
+    tokens = list(TOKEN.finditer(line))
+    if not tokens:
+        return []
+
+    kinds = [_kind(t.group()) for t in tokens]
+    numbers = _number_runs(kinds)
+    runs = sorted(numbers + _heading_runs(tokens, kinds, numbers))
+
+    # neighbouring regions (at most one token apart) are one region
+    merged = []
+    for first, last in runs:
+        if merged and first <= merged[-1][1] + 2:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+
+    return [(tokens[a].start(), tokens[b].end()) for a, b in merged]
+
+
+def strip_tables(line):
+    """
+    (pieces, regions): the stripped (start, end) ranges of line left
+    after cutting out its table regions, and the regions themselves.
+    """
+    regions = find_table_regions(line)
+    if not regions:
+        return ([(0, len(line))] if line else []), []
+
+    pieces = []
+    pos = 0
+    for start, end in regions + [(len(line), len(line))]:
+        s, e = strip_span(line, pos, start)
+        if s < e:
+            pieces.append((s, e))
+        pos = end
+
+    return pieces, regions
@@ -0,0 +1,277 @@
+import os
+import re
+import hashlib
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import classification_report
+from sklearn.pipeline import make_pipeline
+
+from claim_roles import row_role_mask, weak_label
+from claim_spans import materialize
+from corpus_io import list_corpus, read_records
+
+# ==============================
+# CONFIG
+# ==============================
+#
+# Out-of-core version of the TF-IDF + LogisticRegression baseline in
+# app.ipynb. Sentences are streamed from pipeline outputs in chunks:
+#   1. hash     -> HashingVectorizer per chunk in worker processes,
+#                  spilled to disk as sparse matrices; document
+#                  frequencies and class counts summed on the way
+#   2. train    -> chunks reweighted by IDF and fed to partial_fit for
+#                  EPOCHS passes, in shuffled order
+# Only one chunk is in memory at a time, whatever the corpus size.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SOURCES = [
+    os.path.join(BASE_DIR, "atomic_pipeline", "output_atomic_jsonl"),
+]
+
+MODEL_PATH = os.path.join(BASE_DIR, "models", "tfidf_baseline.joblib")
+
+CHUNK_SIZE = 20_000
+N_FEATURES = 2 ** 20     # hashed 1-2 grams (the in-memory fit keeps 8000)
+NGRAM_RANGE = (1, 2)
+EPOCHS = 5
+ALPHA = 1e-6             # SGD regularization; averaged SGD keeps it stable
+TEST_FRACTION = 0.2
+N_JOBS = os.cpu_count() or 1
+RANDOM_STATE = 42
+
+CLASSES = np.array([0, 1, 2])
+
+VECTORIZER_PARAMS = dict(
+    n_features=N_FEATURES,
+    ngram_range=NGRAM_RANGE,
+    stop_words="english",
+    alternate_sign=False,
+    norm=None
+)
+
+_VECTORIZER = HashingVectorizer(**VECTORIZER_PARAMS)
+
+
+# ==============================
+# LABELS (same weak labels as app.ipynb)
+# ==============================
+
+def is_valid_sentence(s):
+    s = s.strip()
+    if len(s.split()) < 6:
+        return False
+    if s.isupper():
+        return False
+    if re.fullmatch(r'[\d\W]+', s):
+        return False
+    return True
+
+
+def weak_greenwashing_label(row):
+    return weak_label(row_role_mask(row))
+
+
+# ==============================
+# STREAMING INPUT
+# ==============================
+
+def iter_paths(sources):
+    for src in sources:
+        if os.path.isdir(src):
+            for fname in list_corpus(src):
+                yield os.path.join(src, fname)
+        elif os.path.exists(src):
+            yield src
+
+
+def iter_examples(sources):
+    """
+    (sentence, label) for every usable record of the pipeline outputs.
+    """
+    for path in iter_paths(sources):
+        for row in read_records(path):
+            row = materialize(row)
+            if not is_valid_sentence(row["sentence"]):
+                continue
+            yield row["sentence"], weak_greenwashing_label(row)
+
+
+def is_holdout(sentence):
+    # stable across runs and processes; duplicates land on the same side
+    h = int(hashlib.md5(sentence.lower().encode("utf-8")).hexdigest()[:8], 16)
+    return h % 100 < TEST_FRACTION * 100
+
+
+def iter_chunks(examples, size=CHUNK_SIZE):
+    """
+    ("train" | "test", sentences, labels) chunks in one pass over
+    examples, split by is_holdout.
+    """
+    buffers = {"train": ([], []), "test": ([], [])}
+
+    for s, y in examples:
+        side = "test" if is_holdout(s) else "train"
+        sentences, labels = buffers[side]
+        sentences.append(s)
+        labels.append(y)
+        if len(sentences) >= size:
+            yield side, sentences, labels
+            buffers[side] = ([], [])
+
+    for side, (sentences, labels) in buffers.items():
+        if sentences:
+            yield side, sentences, labels
+
+
+# ==============================
+# STAGE 1: HASH (parallel)
+# ==============================
+
+def _hash_chunk(sentences, labels, path):
+    """
+    Worker: hashed term counts of one chunk, written to path.
+    Returns what the parent needs to sum up, not the matrix.
+    """
+    X = _VECTORIZER.transform(sentences).tocsr()
+    y = np.asarray(labels, dtype=np.int8)
+
+    sp.save_npz(path + ".X.npz", X)
+    np.save(path + ".y.npy", y)
+
+    cols, df = np.unique(X.indices, return_counts=True)
+    return path, X.shape[0], cols, df, np.bincount(y, minlength=len(CLASSES))
+
+
+def _bounded_map(executor, fn, jobs, window):
+    # executor.map would queue the whole generator; keep the corpus out
+    # of memory by submitting at most `window` chunks ahead
+    pending = deque()
+    for args in jobs:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def hash_corpus(sources, spill_dir, n_jobs=N_JOBS, chunk_size=CHUNK_SIZE):
+    """
+    Hash every chunk into spill_dir.
+
+    Returns (train_paths, test_paths, df, n_train, class_counts); df and
+    class_counts cover the training side only.
+    """
+    def jobs():
+        chunks = iter_chunks(iter_examples(sources), chunk_size)
+        for i, (side, sentences, labels) in enumerate(chunks):
+            yield sentences, labels, os.path.join(spill_dir, f"{side}_{i:05d}")
+
+    df = np.zeros(N_FEATURES, dtype=np.int64)
+    class_counts = np.zeros(len(CLASSES), dtype=np.int64)
+    n_train = 0
+    train_paths, test_paths = [], []
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as ex:
+        for path, n, cols, counts, y_counts in _bounded_map(ex, _hash_chunk, jobs(), 2 * n_jobs):
+            if os.path.basename(path).startswith("test"):
+                test_paths.append(path)
+                continue
+
+            train_paths.append(path)
+            df[cols] += counts
+            class_counts += y_counts
+            n_train += n
+
+    return train_paths, test_paths, df, n_train, class_counts
+
+
+def load_chunk(path):
+    return sp.load_npz(path + ".X.npz"), np.load(path + ".y.npy")
+
+
+# ==============================
+# STAGE 2: TRAIN (partial_fit)
+# ==============================
+
+def fit(sources=SOURCES, model_path=MODEL_PATH, epochs=EPOCHS,
+        n_jobs=N_JOBS, chunk_size=CHUNK_SIZE):
+    """
+    Train on the pipeline outputs and persist a scikit-learn pipeline
+    (hashing -> tfidf -> SGD log-loss) to model_path.
+    Returns (pipeline, report) where report is classification_report
+    on the hash-selected holdout.
+    """
+    with tempfile.TemporaryDirectory() as spill_dir:
+        train_paths, test_paths, df, n_train, class_counts = hash_corpus(
+            sources, spill_dir, n_jobs, chunk_size
+        )
+        if not n_train:
+            raise ValueError("No training sentences found in sources")
+
+        # smoothed idf, as TfidfVectorizer computes it
+        tfidf = TfidfTransformer()
+        tfidf.idf_ = np.log((1 + n_train) / (1 + df)) + 1
+
+        # class_weight="balanced" is not available with partial_fit
+        present = class_counts > 0
+        weights = n_train / (present.sum() * np.maximum(class_counts, 1))
+        clf = SGDClassifier(
+            loss="log_loss",
+            alpha=ALPHA,
+            average=True,
+            class_weight={int(c): float(w) for c, w in zip(CLASSES, weights)},
+            random_state=RANDOM_STATE
+        )
+
+        rng = np.random.default_rng(RANDOM_STATE)
+        for _ in range(epochs):
+            for i in rng.permutation(len(train_paths)):
+                X, y = load_chunk(train_paths[i])
+                # partial_fit does not shuffle; chunks are in report order
+                order = rng.permutation(len(y))
+                clf.partial_fit(tfidf.transform(X[order]), y[order], classes=CLASSES)
+
+        y_true, y_pred = [], []
+        for path in test_paths:
+            X, y = load_chunk(path)
+            y_true.append(y)
+            y_pred.append(clf.predict(tfidf.transform(X)))
+
+    report = None
+    if y_true:
+        report = classification_report(
+            np.concatenate(y_true), np.concatenate(y_pred), zero_division=0
+        )
+
+    model = make_pipeline(HashingVectorizer(**VECTORIZER_PARAMS), tfidf, clf)
+
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    joblib.dump(model, model_path)
+
+    return model, report
+
+
+# ==============================
+# INFERENCE
+# ==============================
+
+def load_model(model_path=MODEL_PATH):
+    """
+    Persisted pipeline; model.predict(sentences) / predict_proba(sentences).
+    """
+    return joblib.load(model_path)
+
+
+if __name__ == "__main__":
+    model, report = fit()
+    if report:
+        print(report)
+    print(f"✅ Model saved to {MODEL_PATH}")
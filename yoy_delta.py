@@ -0,0 +1,228 @@
+import re
+from collections import Counter, defaultdict
+
+import claim_store
+
+# ==============================
+# CONFIG
+# ==============================
+
+# Token Jaccard at or above this pairs a new claim with last year's
+# wording of it ("changed"); below it the claim counts as added.
+CHANGE_THRESHOLD = 0.6
+
+
+# ==============================
+# ALIGNMENT
+# ==============================
+
+def claim_tokens(sentence):
+    return re.findall(r"\w+", sentence.lower())
+
+
+def align(prev, new, threshold=CHANGE_THRESHOLD):
+    """
+    Align this year's claims with last year's.
+
+    prev: [{"sentence", "probability"}, ...] from the previous report
+    new:  [sentence, ...] from the new report
+
+    Returns (unchanged, changed, added, removed):
+      unchanged / changed: [(prev_row, new_sentence), ...]
+      added:               [new_sentence, ...]
+      removed:             [prev_row, ...]
+    """
+    exact = defaultdict(list)
+    for i, row in enumerate(prev):
+        exact[" ".join(claim_tokens(row["sentence"]))].append(i)
+
+    used = set()
+    unchanged = []
+    pending = []
+
+    # 1. Same wording (case, spacing and punctuation ignored)
+    for s in new:
+        candidates = exact.get(" ".join(claim_tokens(s)), [])
+        while candidates and candidates[-1] in used:
+            candidates.pop()
+
+        if candidates:
+            i = candidates.pop()
+            used.add(i)
+            unchanged.append((prev[i], s))
+        else:
+            pending.append(s)
+
+    # 2. Reworded claims: best token overlap among the unmatched
+    postings = defaultdict(list)
+    prev_tokens = {}
+    for i, row in enumerate(prev):
+        if i in used:
+            continue
+        toks = set(claim_tokens(row["sentence"]))
+        prev_tokens[i] = toks
+        for t in toks:
+            postings[t].append(i)
+
+    changed = []
+    added = []
+
+    for s in pending:
+        toks = set(claim_tokens(s))
+        shared = Counter()
+        for t in toks:
+            for i in postings.get(t, ()):
+                if i not in used:
+                    shared[i] += 1
+
+        best, best_score = None, 0.0
+        for i, n in shared.items():
+            score = n / (len(toks) + len(prev_tokens[i]) - n)
+            if score > best_score:
+                best, best_score = i, score
+
+        if best is not None and best_score >= threshold:
+            used.add(best)
+            changed.append((prev[best], s))
+        else:
+            added.append(s)
+
+    removed = [row for i, row in enumerate(prev) if i not in used]
+    return unchanged, changed, added, removed
+
+
+# ==============================
+# DELTA SCORING
+# ==============================
+
+def delta_score(prev, sentences, score_fn, threshold=CHANGE_THRESHOLD):
+    """
+    Score only new or changed claims; unchanged claims inherit last
+    year's probability. score_fn(list_of_sentences) -> list_of_probabilities.
+
+    Returns (rows, removed): one row per new sentence with status,
+    probability and prev_probability, plus last year's dropped claims.
+    """
+    unchanged, changed, added, removed = align(prev, sentences, threshold)
+
+    to_score = [s for _, s in changed] + added
+    scores = dict(zip(to_score, score_fn(to_score))) if to_score else {}
+
+    rows = []
+
+    for old, s in unchanged:
+        rows.append({
+            "sentence": s,
+            "status": "unchanged",
+            "probability": old["probability"],
+            "prev_probability": old["probability"],
+            "prev_sentence": old["sentence"]
+        })
+
+    for old, s in changed:
+        rows.append({
+            "sentence": s,
+            "status": "changed",
+            "probability": scores[s],
+            "prev_probability": old["probability"],
+            "prev_sentence": old["sentence"]
+        })
+
+    for s in added:
+        rows.append({
+            "sentence": s,
+            "status": "added",
+            "probability": scores[s],
+            "prev_probability": None,
+            "prev_sentence": None
+        })
+
+    removed = [
+        {
+            "sentence": None,
+            "status": "removed",
+            "probability": None,
+            "prev_probability": old["probability"],
+            "prev_sentence": old["sentence"]
+        }
+        for old in removed
+    ]
+
+    return rows, removed
+
+
+def summarize(rows, removed, high_risk_threshold):
+    """
+    Counts per status and how overall risk moved against last year.
+    """
+    counts = Counter(r["status"] for r in rows)
+    counts["removed"] = len(removed)
+
+    def exposure(probs):
+        probs = [p for p in probs if p is not None]
+        if not probs:
+            return 0.0
+        return sum(p >= high_risk_threshold for p in probs) / len(probs)
+
+    prev_probs = [r["prev_probability"] for r in rows if r["status"] != "added"]
+    prev_probs += [r["prev_probability"] for r in removed]
+    new_probs = [r["probability"] for r in rows]
+
+    moved = [
+        r["probability"] - r["prev_probability"]
+        for r in rows
+        if r["status"] == "changed" and r["prev_probability"] is not None
+    ]
+
+    return {
+        "unchanged": counts["unchanged"],
+        "changed": counts["changed"],
+        "added": counts["added"],
+        "removed": counts["removed"],
+        "scored": counts["changed"] + counts["added"],
+        "prev_risk_exposure": exposure(prev_probs),
+        "risk_exposure": exposure(new_probs),
+        "mean_changed_delta": sum(moved) / len(moved) if moved else 0.0,
+    }
+
+
+def previous_report(conn, company, year):
+    """
+    (year, scored claims) of the latest earlier report of company in
+    the claim store, or (None, []) when there is none. Only the last
+    scoring run of that report counts, whatever sentence splitting the
+    earlier runs used.
+    """
+    if year is None:
+        return None, []
+
+    prev_year = claim_store.previous_scored_year(conn, company, year)
+    if prev_year is None:
+        return None, []
+
+    return prev_year, claim_store.scored_claims(conn, company, prev_year)
+
+
+# ==============================
+# CLI: YoY diff across the stored corpus
+# ==============================
+
+if __name__ == "__main__":
+    conn = claim_store.connect()
+
+    for company in claim_store.facets(conn)[0]:
+        years = [r[0] for r in conn.execute(
+            "SELECT DISTINCT year FROM claims WHERE company = ? AND year IS NOT NULL ORDER BY year",
+            (company,)
+        )]
+
+        for prev_year, year in zip(years, years[1:]):
+            prev = claim_store.company_claims(conn, company, prev_year)
+            new = [r["sentence"] for r in claim_store.company_claims(conn, company, year)]
+
+            unchanged, changed, added, removed = align(prev, new)
+            print(
+                f"{company} {prev_year}→{year}: "
+                f"{len(unchanged)} unchanged, {len(changed)} changed, "
+                f"{len(added)} added, {len(removed)} removed"
+            )